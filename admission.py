@@ -0,0 +1,118 @@
+import threading
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Per session and form: a burst of SESSION_BURST submissions, then one per SESSION_REFILL_SECONDS
+SESSION_BURST = 3
+SESSION_REFILL_SECONDS = 20.0
+# Process wide: writes running at once, writes allowed to wait, and how long they wait
+MAX_IN_FLIGHT = 2
+MAX_QUEUED = 16
+QUEUE_TIMEOUT_SECONDS = 2.0
+BUSY_MESSAGE = "We're receiving a lot of submissions right now. Please try again shortly."
+# Idle sessions' buckets are dropped once this many are tracked
+MAX_SESSIONS = 10_000
+
+
+class AdmissionControl:
+    """Admission control for the submission forms.
+
+    Every (session, form) pair gets a token bucket, so a scripted client can
+    only submit at the refill rate, and filling in one form never uses up
+    the other's allowance. Admitted writes then take one of MAX_IN_FLIGHT
+    slots; up to MAX_QUEUED more wait briefly for a slot, and anything beyond
+    that is turned away at once instead of piling onto the disk. A write
+    turned away as busy gets its token back, since it never ran. Rejected
+    requests cost a dictionary lookup, so real users' latency stays flat
+    while a burst is shed.
+    """
+
+    def __init__(self, burst=SESSION_BURST, refill_seconds=SESSION_REFILL_SECONDS,
+                 max_in_flight=MAX_IN_FLIGHT, max_queued=MAX_QUEUED, queue_timeout=QUEUE_TIMEOUT_SECONDS):
+        self.burst = burst
+        self.refill_seconds = refill_seconds
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self._lock = threading.Lock()
+        self._buckets = {}  # (session id, form) -> (tokens, last update)
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._queued = 0
+
+    def _take_token(self, key, now):
+        # Returns 0 if a token was taken, else the seconds until the next one
+        tokens, updated = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) / self.refill_seconds)
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) * self.refill_seconds
+        self._buckets[key] = (tokens - 1, now)
+        if len(self._buckets) > MAX_SESSIONS:
+            self._prune(now)
+        return 0
+
+    def _prune(self, now):
+        full = [session for session, (tokens, updated) in self._buckets.items()
+                if tokens + (now - updated) / self.refill_seconds >= self.burst]
+        for session in full:
+            del self._buckets[session]
+
+    def _refund(self, key):
+        # Give back the token of a write that was turned away as busy
+        if key in self._buckets:
+            tokens, updated = self._buckets[key]
+            self._buckets[key] = (min(self.burst, tokens + 1), updated)
+
+    def _enter(self, key):
+        # Returns a refusal message, or None once a write slot is held
+        with self._lock:
+            wait = self._take_token(key, time.monotonic())
+            if wait:
+                return f"You're submitting very quickly. Please try again in {int(wait) + 1} seconds."
+            if self._slots.acquire(blocking=False):
+                return None
+            if self._queued >= self.max_queued:
+                self._refund(key)
+                return BUSY_MESSAGE
+            self._queued += 1
+
+        acquired = self._slots.acquire(timeout=self.queue_timeout)
+        with self._lock:
+            self._queued -= 1
+            if not acquired:
+                self._refund(key)
+        return None if acquired else BUSY_MESSAGE
+
+    @contextmanager
+    def admit(self, key):
+        """Yield None if the write may go ahead, else a message for the user.
+
+        `key` identifies whose token bucket pays for the write.
+        """
+        refusal = self._enter(key)
+        if refusal:
+            yield refusal
+            return
+        try:
+            yield None
+        finally:
+            self._slots.release()
+
+
+@st.cache_resource(show_spinner=False)
+def get_admission_control():
+    # Shared by every session and both forms, since they write to the same disk
+    return AdmissionControl()
+
+
+@contextmanager
+def admitted(form):
+    """Gate a submission of `form`: yields True if it may proceed, else shows a warning and yields False."""
+    ctx = get_script_run_ctx()
+    session_id = ctx.session_id if ctx is not None else 'script'
+    with get_admission_control().admit((session_id, form)) as refusal:
+        if refusal:
+            st.warning(refusal)
+        yield refusal is None
@@ -0,0 +1,191 @@
+import hashlib
+
+import pandas as pd
+import plotly.express as px
+
+# Precomputed results from the discourse analysis shown on the Global HR Compass page
+
+PRACTICE_FREQUENCY = {
+    "Frequency": [364, 277, 251, 220, 184, 166, 166, 152, 141, 134],
+    "HRM Practices": ["Training", "Org.Culture", "Motivation", "Leadership", "Job Design", "HRM", "Comp&Benefits", "Health and Safety", "Selection", "D&I"]
+}
+
+DISCOURSE_TOPICS = {
+    "💼 Work From Home": "Work From Home in the gig economy enables high-skilled roles to be outsourced globally, advancing gig workers up the value chain, while its flexibility particularly empowers women to participate more actively than in traditional sectors.",
+    "🏢 HRM": "HRM in the gig economy must adapt by providing training, benefits, and inclusive engagement for non-permanent talent, while balancing the opportunities (global access to high-skilled roles, cost efficiency, innovation) with risks (security, competition) as gig workers increasingly become important." ,
+    "🤝 Talent Management": "HR Managers in the gig economy must bridge skill gaps through targeted training for freelancers, while strategically assessing which roles suit gig-based models and retaining leadership qualities that require long-term organizational alignment.",
+    "🦾 AI in Gig Economy": "AI in Gig Work is rapidly transforming labor markets by automating tasks like job description creation and enabling gig workers to find opportunities through AI-powered platforms. For gig workers, adapting to AI-driven skill demands is critical, while HR managers must integrate AI competencies into their practices to effectively recruit, manage, and support this evolving workforce",
+    "🫂 Freelancers": "The number of gig workers is rising globally. They operate as freelancers and independent contractors who must navigate self-managed taxes and limited benefits, while HR adapts to integrate this agile talent pool into organizational workflows.",
+    "🚕 Gig Apps": "Gig Apps are an important component of the gig economy, connecting skilled workers with organizations through platforms like Fiverr Business and Catalant, while reshaping work experiences via streamlined project matching and case study-driven models in tech, design, and beyond.",
+    "⚕️ COVID": "COVID-19 redefined work for everyone including gig workers. Many employees made a shift to prioritizing freedom, work-life balance, and happiness over traditional career markers. Consequently, accelerating the shift of millennials and others to gig work as a sustainable, fulfilling alternative in the post-pandemic economy.",
+    "💱 Gig Economy": "Gig Economy engagement among HR professionals surged 50% (2018–2023), reflecting rapid adaptation to structural workforce shifts—from pandemic-driven remote work to permanent gig worker integration—as organizations redefine talent strategies for flexibility and resilience."
+}
+
+PRACTICE_EVOLUTION = {
+    "Year": ["2009", "2016", "2017", "2018", "2019", "2020", "2021", "2022", "2023", "2024"],
+    "Compensation & Benefits": [0, 0, 1, 4, 3, 3, 7, 12, 8, 4],
+    "D&I": [0, 0, 0, 2, 0, 2, 3, 3, 1, 2],
+    "Health & Safety": [0, 0, 0, 0, 1, 4, 2, 5, 2, 5],
+    "HRM": [1, 1, 4, 18, 7, 21, 17, 19, 12, 11],
+    "Job Design": [0, 1, 2, 4, 7, 5, 4, 5, 5, 2],
+    "Leadership": [0, 0, 3, 8, 12, 10, 12, 23, 9, 9],
+    "Motivation": [0, 0, 0, 2, 3, 4, 6, 12, 6, 6],
+    "Organization Culture": [0, 3, 3, 5, 6, 15, 10, 7, 6, 2],
+    "Selection": [0, 1, 3, 6, 6, 10, 7, 8, 5, 7],
+    "Training & Development": [0, 0, 3, 4, 6, 6, 9, 18, 10, 7]
+}
+
+# Relationship between topics and HRM practices, shown as a radar chart
+PRACTICE_TOPIC_WEIGHTS = {
+    "HRM Practices": ["Compensation & Benefits", "D&I", "Health and Safety", "HRM",
+                    "Job Design", "Leadership", "Motivation", "Organizational culture",
+                    "Selection", "Training & Development"],
+    "Work from Home": [666, 1158, 1040, 813, 905, 826, 1188, 1157, 560, 1708],
+    "Talent Management": [577, 971, 884, 658, 748, 791, 987, 1079, 484, 1524],
+    "HRM": [473, 851, 745, 620, 600, 721, 823, 895, 389, 1333],
+    "Gig Apps": [281, 450, 387, 314, 379, 254, 662, 371, 210, 587],
+    "Freelancers": [430, 642, 597, 421, 678, 456, 786, 611, 308, 936],
+    "Covid": [306, 514, 561, 340, 391, 390, 526, 531, 249, 807],
+    "AI in gig work": [554, 1004, 880, 717, 729, 725, 997, 1018, 474, 1477]
+}
+
+# Defaults of the sidebar chart customization sliders
+DEFAULT_CHART_STYLE = dict(line_width=2, axis_title_font_size=14, axis_tick_font_size=12, legend_font_size=12)
+
+# Changes whenever the datasets above are edited; used to version rendered snapshots
+COMPASS_VERSION = hashlib.sha1(
+    repr((PRACTICE_FREQUENCY, DISCOURSE_TOPICS, PRACTICE_EVOLUTION, PRACTICE_TOPIC_WEIGHTS)).encode('utf-8')
+).hexdigest()[:12]
+
+
+def practice_frequency_figure(axis_title_font_size, axis_tick_font_size):
+    data = pd.DataFrame(PRACTICE_FREQUENCY)
+    colors = ['#21409a','#04adff','#e48873','#f16623','#f44546','#03a8a0','#039c4b','#66d313','#fedf17','#ff0984']
+    fig = px.bar(data, x='Frequency', y='HRM Practices',
+                        color='HRM Practices',
+                        color_discrete_sequence=colors[:len(data)],
+                        )
+    fig.update_traces(textposition='outside')
+    fig.update_layout(
+        xaxis_title='Frequency',
+        yaxis_title='HRM Practices',
+        showlegend=False
+    )
+    fig.update_layout(
+    font=dict(
+        size=axis_tick_font_size  # Base font size
+    ),
+    xaxis=dict(
+        title=dict(
+            text="Frequency",
+            font=dict(size=axis_title_font_size)
+        ),
+        tickfont=dict(size=axis_tick_font_size)
+    ),
+    yaxis=dict(
+        title=dict(
+            text="HRM Practices",
+            font=dict(size=axis_title_font_size)
+        ),
+        tickfont=dict(size=axis_tick_font_size)
+    ),
+    hoverlabel=dict(
+        font=dict(size=axis_tick_font_size)
+    ),
+)
+    return fig
+
+
+def practice_evolution_figure(line_width, axis_title_font_size, axis_tick_font_size, legend_font_size):
+    df = pd.DataFrame(PRACTICE_EVOLUTION)
+    # Melt dataframe for Plotly (convert wide to long format)
+    df_melted = df.melt(id_vars='Year', var_name='HRM Practices', value_name='Value')
+
+    # Create interactive plot
+    fig = px.line(
+        df_melted,
+        x="Year",
+        y="Value",
+        color="HRM Practices",
+        line_shape="linear",
+        width=1000,
+        height=500
+    )
+
+    # Update line styles
+    fig.update_traces(
+        line=dict(width=line_width),
+        marker=dict(size=8)
+    )
+
+    # Update layout
+    fig.update_layout(
+        xaxis_title="Year",
+        yaxis_title= "Percentage Occurence in the Discourse",
+        legend_title="HRM Practices",
+        hovermode="x unified",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    fig.update_layout(
+    font=dict(
+        size=axis_tick_font_size  # Base font size
+    ),
+    xaxis=dict(
+        title=dict(
+            text="Year",
+            font=dict(size=axis_title_font_size)
+        ),
+        tickfont=dict(size=axis_tick_font_size)
+    ),
+    yaxis=dict(
+        title=dict(
+            text="Percentage Occurence in the Discourse",
+            font=dict(size=axis_title_font_size)
+        ),
+        tickfont=dict(size=axis_tick_font_size)
+    ),
+    legend=dict(
+        title=dict(
+            text="HRM Practices",
+            font=dict(size=legend_font_size)
+        ),
+        font=dict(size=legend_font_size)
+    ),
+    hoverlabel=dict(
+        font=dict(size=axis_tick_font_size)
+    ),
+)
+    return fig
+
+
+def topic_radar_figure(practice):
+    df = pd.DataFrame(PRACTICE_TOPIC_WEIGHTS)
+
+    # Melt the dataframe for Plotly
+    df_melted = df.melt(id_vars=["HRM Practices"],
+                        var_name="Topic",
+                        value_name="Weight")
+
+    # Filter data for selected practice
+    filtered_df = df_melted[df_melted["HRM Practices"] == practice]
+
+    fig = px.line_polar(
+        filtered_df,
+        r="Weight",
+        theta="Topic",
+        line_close=True,
+        template="plotly_dark",
+        # title=f"{practice} Relationship with Discourse Topics by Topic Weights"
+    )
+
+    fig.update_traces(fill='toself')
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, df_melted["Weight"].max() * 1.1]
+            )),
+        showlegend=False,
+        height=600
+    )
+    return fig
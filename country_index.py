@@ -0,0 +1,139 @@
+import bisect
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+
+import pycountry
+
+# Everyday names keyed by ISO-3 code, shown in the country picker next to the
+# pycountry name so typing "Vietnam" or "UK" finds the right entry
+COUNTRY_ALIASES = {
+    'BIH': ["Bosnia"],
+    'BRN': ["Brunei"],
+    'CIV': ["Ivory Coast"],
+    'COD': ["DR Congo"],
+    'COG': ["Congo-Brazzaville"],
+    'CPV': ["Cape Verde"],
+    'CZE': ["Czech Republic"],
+    'GBR': ["UK", "Great Britain"],
+    'MKD': ["Macedonia"],
+    'MMR': ["Burma"],
+    'PSE': ["Palestine"],
+    'RUS': ["Russia"],
+    'SWZ': ["Swaziland"],
+    'TLS': ["East Timor"],
+    'TUR': ["Turkey"],
+    'USA': ["USA", "US"],
+    'VAT': ["Vatican"],
+    'VNM': ["Vietnam"],
+}
+
+Country = namedtuple('Country', ['name', 'alpha_2', 'alpha_3', 'aliases', 'official_name'])
+
+
+def _normalize(text):
+    # Case and accent insensitive key, so "cote d'ivoire" finds "Côte d'Ivoire"
+    text = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode()
+    return ' '.join(text.casefold().split())
+
+
+class CountryIndex:
+    """Lookup tables over pycountry, built once per process by `get_country_index`.
+
+    Every country is reachable by its pycountry name, official name,
+    ISO-2/ISO-3 code and aliases, exactly (`lookup`) or by prefix (`search`).
+    Picker labels show only the name and the short aliases. Natural Earth
+    names and UN regions are added by `attach_world` once the map geometry
+    has been loaded, joined on the ISO-3 code.
+    """
+
+    def __init__(self, countries):
+        self.countries = sorted(countries, key=lambda country: country.name)
+        self.names = [country.name for country in self.countries]
+        self.by_alpha_3 = {country.alpha_3: country for country in self.countries}
+        self.ne_names = {}
+        self.regions = {}
+
+        self._by_key = {}
+        for country in self.countries:
+            for key in (country.name, country.alpha_2, country.alpha_3, *country.aliases, country.official_name):
+                if key:
+                    self._by_key.setdefault(_normalize(key), country)
+        # Sorted keys let prefix search run as a binary search
+        self._sorted_keys = sorted(self._by_key)
+        self._labels = {
+            country.name: (
+                f"{country.name} ({', '.join(country.aliases)})" if country.aliases else country.name
+            )
+            for country in self.countries
+        }
+
+    @classmethod
+    def from_pycountry(cls):
+        countries = []
+        for entry in pycountry.countries:
+            aliases = [
+                alias for alias in (getattr(entry, 'common_name', None), *COUNTRY_ALIASES.get(entry.alpha_3, []))
+                if alias and alias != entry.name
+            ]
+            countries.append(Country(entry.name, entry.alpha_2, entry.alpha_3, tuple(dict.fromkeys(aliases)),
+                                     getattr(entry, 'official_name', None)))
+        return cls(countries)
+
+    def lookup(self, text):
+        # Exact match on name, ISO code or alias; None for unknown or empty input
+        if text is None or text != text:
+            return None
+        return self._by_key.get(_normalize(text))
+
+    def code_for(self, text):
+        country = self.lookup(text)
+        return country.alpha_3 if country else None
+
+    def search(self, prefix, limit=10):
+        # Countries whose name, official name, code or alias starts with `prefix`
+        key = _normalize(prefix)
+        start = bisect.bisect_left(self._sorted_keys, key)
+        found = []
+        for candidate in self._sorted_keys[start:]:
+            if not candidate.startswith(key) or len(found) >= limit:
+                break
+            country = self._by_key[candidate]
+            if country not in found:
+                found.append(country)
+        return found
+
+    def resolve(self, text):
+        # Picker input to a country: exact name, code or alias first, else the only prefix match
+        country = self.lookup(text)
+        if country is None and text:
+            matches = self.search(text, limit=2)
+            country = matches[0] if len(matches) == 1 else None
+        return country
+
+    def region_for(self, text):
+        # UN region of a country, once the map geometry has been attached
+        country = self.lookup(text)
+        return self.regions.get(country.alpha_3) if country else None
+
+    def label(self, name):
+        # Selectbox label; aliases are included so typing "Vietnam" finds "Viet Nam"
+        return self._labels.get(name, name)
+
+
+    def attach_world(self, world):
+        # Record Natural Earth names and UN regions, keyed by the ISO-3 code of each shape
+        for code, name, region in zip(world['ISO3'], world['NAME'], world['REGION_UN']):
+            if code in self.by_alpha_3:
+                self.ne_names[code] = name
+                self.regions[code] = region
+
+def natural_earth_codes(world):
+    # Natural Earth leaves ISO_A3 as -99 for a few countries (e.g. France, Norway);
+    # ADM0_A3 carries the code for those
+    return world['ISO_A3'].where(world['ISO_A3'] != '-99', world['ADM0_A3'])
+
+
+@lru_cache(maxsize=None)
+def get_country_index():
+    return CountryIndex.from_pycountry()
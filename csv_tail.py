@@ -0,0 +1,49 @@
+"""Incremental reads of append-only CSV files from a byte cursor."""
+import collections
+import os
+
+import numpy as np
+
+Appended = collections.namedtuple('Appended', 'header start chunk ends cursor rewritten')
+
+
+def record_ends(chunk):
+    """Offsets just past each CSV record's closing newline in `chunk`.
+
+    A newline ends a record only outside a quoted field, i.e. where the
+    number of quote characters before it is even (an escaped "" counts
+    twice, so it never flips the parity).
+    """
+    data = np.frombuffer(chunk, dtype=np.uint8)
+    newlines = np.flatnonzero(data == ord('\n'))
+    quotes_before = np.cumsum(data == ord('"'))[newlines]
+    return newlines[quotes_before % 2 == 0] + 1
+
+
+def read_appended(path, header=None, cursor=0):
+    """The complete records appended to the CSV at `path` since byte `cursor`.
+
+    `header` is the header line the cursor was taken under, or None on the
+    first read. Returns None if the file doesn't exist, else an Appended:
+    the file's `header` line, the bytes read (`chunk`, starting at offset
+    `start`), the `ends` of its complete records relative to `chunk`, and
+    the new `cursor` just past the last of them. A record still being
+    written is left for the next read. If the header changed or the file
+    shrank below `cursor`, it was rewritten: `rewritten` is set and the
+    read starts again after the header.
+    """
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return None
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        current = f.readline()
+        rewritten = header is not None and (current != header or size < cursor)
+        if header is None or rewritten:
+            cursor = len(current)
+        f.seek(cursor)
+        chunk = f.read(max(size - cursor, 0))
+    ends = record_ends(chunk)
+    end = cursor + (int(ends[-1]) if len(ends) else 0)
+    return Appended(current, cursor, chunk, ends, end, rewritten)
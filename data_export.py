@@ -0,0 +1,183 @@
+import glob
+import hashlib
+import html
+import itertools
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+import streamlit as st
+
+from data_paths import APP_DIR
+
+# Download formats offered to researchers, with their file extensions
+EXPORT_FORMATS = {
+    'CSV': 'csv',
+    'Parquet': 'parquet',
+    'JSONL': 'jsonl',
+}
+
+# Rows read per chunk; bounds peak memory regardless of file size
+CHUNK_SIZE = 50_000
+
+# Under static/, so Streamlit's static file server streams downloads from disk
+EXPORT_DIR = os.path.join(APP_DIR, 'static', 'exports')
+EXPORT_URL = 'app/static/exports'
+# Streamlit's static server refuses files over 200 MB, so larger exports are split into parts
+PART_BYTES = 128 * 1024 * 1024
+
+
+def iter_chunks(path, columns=None, start=None, end=None, date_column='timestamp', chunksize=CHUNK_SIZE):
+    """Yield the rows of a stored CSV in chunks, optionally filtered by column and date.
+
+    Values are read as raw strings so every chunk has the same schema and the
+    export matches the stored file exactly. Rows whose `date_column` cannot be
+    parsed are dropped when a date filter is given.
+    """
+    header = list(pd.read_csv(path, nrows=0).columns)
+    columns = [column for column in (columns or header) if column in header]
+    filter_dates = (start is not None or end is not None) and date_column in header
+    usecols = columns + [date_column] if filter_dates and date_column not in columns else columns
+
+    for chunk in pd.read_csv(path, usecols=usecols, dtype=str, keep_default_na=False, chunksize=chunksize):
+        if filter_dates:
+            dates = pd.to_datetime(chunk[date_column], errors='coerce', format='mixed')
+            mask = dates.notna()
+            if start is not None:
+                mask &= dates >= pd.Timestamp(start)
+            if end is not None:
+                mask &= dates < pd.Timestamp(end)
+            chunk = chunk[mask]
+        if not chunk.empty:
+            yield chunk[columns]
+
+
+def write_chunks(chunks, fmt, out, columns=()):
+    """Write an iterable of DataFrame chunks to the binary file object `out`.
+
+    `columns` gives the header (CSV) or schema (Parquet) written when there
+    are no chunks at all, so an empty export is still a valid file.
+    """
+    if fmt == 'Parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out, table.schema)
+            writer.write_table(table)
+        if writer is None:
+            # Values are exported as strings, see iter_chunks
+            writer = pq.ParquetWriter(out, pa.schema([(column, pa.string()) for column in columns]))
+        writer.close()
+        return
+
+    first = True
+    for chunk in chunks:
+        if fmt == 'CSV':
+            out.write(chunk.to_csv(index=False, header=first).encode('utf-8'))
+        else:
+            out.write(chunk.to_json(orient='records', lines=True, force_ascii=False).rstrip('\n').encode('utf-8'))
+            out.write(b'\n')
+        first = False
+    if first and fmt == 'CSV':
+        out.write(pd.DataFrame(columns=list(columns)).to_csv(index=False).encode('utf-8'))
+
+
+def _remove_stale_exports(base, current):
+    # Exports of older versions of the same source file; in-progress .part files are left alone
+    for name in os.listdir(EXPORT_DIR):
+        if name.startswith(f"{base}-") and not name.startswith(current) and not name.endswith('.part'):
+            try:
+                os.remove(os.path.join(EXPORT_DIR, name))
+            except FileNotFoundError:
+                pass  # Removed by another session at the same time
+
+
+def _until_size(chunks, out, limit):
+    # Chunks for one part file: stops once `out` has grown past `limit`
+    for chunk in chunks:
+        yield chunk
+        if out.tell() >= limit:
+            return
+
+
+def export_file(path, fmt, columns=None, start=None, end=None, date_column='timestamp'):
+    """Export `path` to EXPORT_DIR and return the paths of its part files.
+
+    The export is written chunk by chunk, starting a new part file whenever
+    one passes PART_BYTES. Files are named after the source file's size and
+    mtime plus the request, so repeated downloads of unchanged data reuse the
+    files already on disk. Writing an export for a new version of the source
+    removes the exports of older versions.
+    """
+    stat = os.stat(path)
+    source = repr((os.path.abspath(path), stat.st_size, stat.st_mtime_ns))
+    request = repr((fmt, columns, start, end, date_column))
+    base = os.path.splitext(os.path.basename(path))[0]
+    version = f"{base}-{hashlib.sha1(source.encode('utf-8')).hexdigest()[:12]}-"
+    digest = hashlib.sha1(request.encode('utf-8')).hexdigest()[:12]
+    stem, extension = os.path.join(EXPORT_DIR, f"{version}{digest}"), EXPORT_FORMATS[fmt]
+    if os.path.exists(f"{stem}.{extension}"):
+        return [f"{stem}.{extension}"] + sorted(glob.glob(f"{stem}-part*.{extension}"),
+                                                key=lambda name: int(name.rsplit('-part', 1)[1].split('.')[0]))
+
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    if columns is None:
+        columns = list(pd.read_csv(path, nrows=0).columns)
+    chunks = iter_chunks(path, columns, start, end, date_column)
+    targets, partials = [], []
+    while True:
+        target = f"{stem}.{extension}" if not targets else f"{stem}-part{len(targets) + 1}.{extension}"
+        partial = f"{target}.{os.getpid()}.part"
+        with open(partial, 'wb') as out:
+            write_chunks(_until_size(chunks, out, PART_BYTES), fmt, out, columns)
+        targets.append(target)
+        partials.append(partial)
+        following = next(chunks, None)
+        if following is None:
+            break
+        chunks = itertools.chain([following], chunks)
+    # The first file is published last, so once it exists all the parts do
+    for partial, target in reversed(list(zip(partials, targets))):
+        os.replace(partial, target)
+    _remove_stale_exports(base, version)
+    return targets
+
+
+def show_export_panel(path, title, key, date_column='timestamp'):
+    with st.expander(f"⬇️ Download {title}"):
+        if not os.path.exists(path):
+            st.info("Nothing to download yet.")
+            return
+
+        all_columns = list(pd.read_csv(path, nrows=0).columns)
+        columns = st.multiselect("Columns", all_columns, default=all_columns, key=f"{key}_columns")
+        fmt = st.radio("Format", list(EXPORT_FORMATS), horizontal=True, key=f"{key}_format")
+
+        start = end = None
+        if st.checkbox("Only include a date range", key=f"{key}_filter_dates"):
+            today = datetime.now().date()
+            dates = st.date_input("Date range", value=(today - timedelta(days=365), today), key=f"{key}_dates")
+            if len(dates) == 2:
+                start, end = pd.Timestamp(dates[0]), pd.Timestamp(dates[1]) + pd.Timedelta(days=1)
+
+        if st.button("Prepare download", key=f"{key}_prepare", disabled=not columns):
+            with st.spinner("Preparing export..."):
+                st.session_state[f"{key}_export"] = export_file(path, fmt, columns, start, end, date_column)
+
+        targets = st.session_state.get(f"{key}_export")
+        if targets and all(os.path.exists(target) for target in targets):
+            # Plain links served from static/, streamed from disk rather than through the media store
+            base = os.path.splitext(os.path.basename(path))[0]
+            for number, target in enumerate(targets, start=1):
+                extension = os.path.splitext(target)[1].lstrip('.')
+                file_name = f"{base}.{extension}" if len(targets) == 1 else f"{base}-part{number}.{extension}"
+                url = f"{EXPORT_URL}/{os.path.basename(target)}"
+                st.markdown(
+                    f'<a href="{html.escape(url)}" download="{html.escape(file_name)}">⬇️ Download {html.escape(file_name)}</a>'
+                    f' ({os.path.getsize(target) / 1e6:.1f} MB)',
+                    unsafe_allow_html=True,
+                )
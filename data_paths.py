@@ -0,0 +1,15 @@
+"""Locations of the app's data files.
+
+Everything is anchored to the app directory rather than the working
+directory, so the app, the file watcher and the offline scripts agree on the
+files whichever directory they are started from (e.g. `python serve.py` from
+elsewhere).
+"""
+import os
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SURVEY_FILE = os.path.join(APP_DIR, 'hr_survey_data.csv')
+STORY_FILE = os.path.join(APP_DIR, 'stories.csv')
+# Story submissions waiting for moderation
+SUBMITTED_STORY_FILE = os.path.join(APP_DIR, 'submitted_stories.csv')
@@ -0,0 +1,92 @@
+import os
+import threading
+
+import streamlit as st
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from data_paths import STORY_FILE, SUBMITTED_STORY_FILE, SURVEY_FILE
+
+# Data files shared by all app replicas, grouped into the datasets caches depend on
+WATCHED_FILES = {
+    SURVEY_FILE: 'survey',
+    STORY_FILE: 'stories',
+    SUBMITTED_STORY_FILE: 'stories',
+}
+
+
+def _signature(dataset):
+    signature = []
+    for path, owner in WATCHED_FILES.items():
+        if owner == dataset:
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_size, stat.st_mtime_ns))
+            except FileNotFoundError:
+                signature.append((path, None, None))
+    return tuple(signature)
+
+
+class DataVersions:
+    """Per-process version counters for the shared data files.
+
+    A watchdog observer calls `refresh` when a watched file changes on disk,
+    whichever replica wrote it. The version only moves when the files' size or
+    mtime actually differ, so a write seen both by the writer and by the
+    watcher invalidates the dependent caches once. Caches take the version of
+    their dataset as an argument, so only caches of the changed dataset reload.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._signatures = {dataset: _signature(dataset) for dataset in set(WATCHED_FILES.values())}
+        self._versions = {dataset: 0 for dataset in self._signatures}
+        self.watching = False
+
+    def refresh(self, dataset):
+        signature = _signature(dataset)
+        with self._lock:
+            if signature != self._signatures[dataset]:
+                self._signatures[dataset] = signature
+                self._versions[dataset] += 1
+            return self._versions[dataset]
+
+    def get(self, dataset):
+        # Without a running watcher, fall back to checking the files on each call
+        if not self.watching:
+            return self.refresh(dataset)
+        return self._versions[dataset]
+
+
+class _DataFileHandler(FileSystemEventHandler):
+    def __init__(self, versions):
+        self.versions = versions
+
+    def on_any_event(self, event):
+        # Atomic saves show up as moves, so check the destination as well
+        for path in (event.src_path, getattr(event, 'dest_path', '')):
+            dataset = WATCHED_FILES.get(os.path.abspath(path)) if path else None
+            if dataset:
+                self.versions.refresh(dataset)
+
+
+@st.cache_resource(show_spinner=False)
+def get_data_versions():
+    # One set of counters and one observer thread per server process
+    versions = DataVersions()
+    observer = Observer()
+    observer.daemon = True
+    try:
+        handler = _DataFileHandler(versions)
+        for directory in {os.path.dirname(path) for path in WATCHED_FILES}:
+            observer.schedule(handler, directory, recursive=False)
+        observer.start()
+        versions.watching = True
+    except OSError:
+        # e.g. the inotify watch limit is reached; get() then stats the files instead
+        pass
+    return versions
+
+
+def data_version(dataset):
+    return get_data_versions().get(dataset)
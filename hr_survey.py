@@ -3,123 +3,163 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import plotly.express as px
 import geopandas as gpd
-import pycountry
 from datetime import datetime
-import os
+import io
 
-# Initialize session state for data storage with a unique key
-if 'hr_survey_data' not in st.session_state:
-    st.session_state.hr_survey_data = pd.DataFrame(columns=[
-        'timestamp', 'location', 'department', 
-        'hiring_time', 'fair_strategies', 'rehire', 'payment_negotiation'
-    ])
-    # Load existing data immediately upon first visit
-    if os.path.exists('hr_survey_data.csv'):
-        st.session_state.hr_survey_data = pd.read_csv('hr_survey_data.csv')
+from admission import admitted
+from country_index import get_country_index, natural_earth_codes
+from data_export import show_export_panel
+from data_watch import data_version, get_data_versions
+from report_snapshots import show_snapshot
+from survey_charts import SURVEY_CHARTS, SURVEY_CHART_LAYOUT, chart_counts, count_bar_figure
+from survey_state import SurveyState
+from survey_store import append_responses, prepare_store
+from survey_stats import chi_square
+from survey_trends import TREND_FREQUENCIES
+from survey_schema import HR_SURVEY
+
+SURVEY_FILE = HR_SURVEY.file
+
+# Seconds between polls of the data version while live updates are on
+LIVE_REFRESH_SECONDS = 10
+
+@st.cache_resource(show_spinner=False)
+def load_survey_state():
+    """Survey aggregates (cube and trends) shared by all sessions of this process.
+
+    Kept current by folding in only the rows appended since the last read, so
+    a new response from this or any other replica doesn't reload the file.
+    Treat as read-only. Loading it first brings an older store's header up to
+    date, once per process (the warm-up does this at startup).
+    """
+    prepare_store(SURVEY_FILE)
+    return SurveyState(SURVEY_FILE)
+
+def get_survey_state():
+    """The current survey aggregates, as one snapshot that later responses never change."""
+    # Free unless the data version moved; then only the new rows are read
+    return load_survey_state().catch_up(data_version('survey'))
 
 # Function to save survey data and update dashboard
-def save_survey(location, department, hiring_time, fair_strategies, rehire, payment_negotiation):
-    new_entry = {
-        'timestamp': datetime.now(),
-        'location': location,
-        'department': department,
-        'hiring_time': hiring_time,
-        'fair_strategies': ", ".join(fair_strategies) if isinstance(fair_strategies, list) else fair_strategies,
-        'rehire': rehire,
-        'payment_negotiation': payment_negotiation
-    }
-    
-    # Convert to DataFrame and append
-    new_df = pd.DataFrame([new_entry])
-    st.session_state.hr_survey_data = pd.concat([st.session_state.hr_survey_data, new_df], ignore_index=True)
+def save_survey(answers):
+    """Store one response; returns False if admission control turned it away."""
+    new_entry = HR_SURVEY.entry(answers, datetime.now())
     
-    # Save to CSV (overwrite entire file to maintain consistency)
-    st.session_state.hr_survey_data.to_csv('hr_survey_data.csv', index=False)
+    with admitted('survey') as ok:
+        if not ok:
+            return False
+        # Append to CSV; replicas sharing the file pick the row up through their watcher
+        load_survey_state()  # the store's header is migrated before the first append
+        append_responses(pd.DataFrame([new_entry], columns=HR_SURVEY.columns), SURVEY_FILE)
+    # Bump this process's version now rather than waiting for the file event
+    get_data_versions().refresh('survey')
     st.success("Thank you for completing the survey!")
+    return True
 
-def show_hr_survey():
-    st.title("HR Hiring Practices for Gig Workers: Survey")
-    
-    with st.form("hr_survey_form"):
-        # # Location input
-        # country_names = [country.name for country in pycountry.countries]
-        # location = st.selectbox("Select your location/country:", sorted(country_names))
-        # Location input
-        country_names = [country.name for country in pycountry.countries]
-        location = st.selectbox(
-            "Select your location/country:", 
-            sorted(country_names),
+def survey_input(question):
+    # One form input per question, chosen by its kind and widget in the schema
+    if question.kind == 'country':
+        # Names and aliases come from the process-wide country index
+        countries = get_country_index()
+        value = st.selectbox(
+            question.prompt,
+            countries.names,
+            format_func=countries.label,  # Aliases in the label make "Vietnam" or "UK" searchable
             index=None,  # No default selection
             placeholder="Choose your country...",  # Prompt text when nothing is selected
+            accept_new_options=True,  # Typed text is resolved by alias or prefix below
         )
+        if value is None or value in countries.names:
+            return value
+        country = countries.resolve(value)
+        if country is None:
+            st.warning(f"We couldn't find a country matching \"{value}\". Please pick one from the list.")
+            return None
+        return country.name
+    widget = getattr(st, question.widget)
+    return widget(question.prompt, options=list(question.options))
 
-        
-        # Department selection
-        departments = [
-            "Recruitment", "Training", "Onboarding", "Hiring", 
-            "Compensation", "Employee Relations", "Talent Management"
-        ]
-        department = st.selectbox("Select your HR department:", departments)
-        
-        # Question 1: Hiring time
-        hiring_time = st.select_slider(
-            "1. How long does your organization typically take to hire gig workers?",
-            options=["Less than 1 week", "1-2 weeks", "2-4 weeks", "1-2 months", "More than 2 months"]
-        )
-        
-        # Question 2: Fair hiring strategies
-        fair_strategies = st.multiselect(
-            "2. What strategies does your organization use to make the gig-worker's hiring process fair? (Select all that apply)",
-            options=[
-                "Blind resume screening",
-                "Structured interviews",
-                "Diverse hiring panels",
-                "Skills-based assessments",
-                "Standardized evaluation criteria",
-                "Bias training for interviewers",
-                "Other"
-            ]
-        )
-        
-        # Question 3: Re-hiring
-        rehire = st.radio(
-            "3. Does your organization actively re-hire former gig workers?",
-            options=["Yes, frequently", "Occasionally", "Rarely", "Never"]
-        )
-        
-        # Question 4: Payment negotiation
-        payment_negotiation = st.selectbox(
-            "4. How does your organization typically negotiate with gig workers and decide on their payment?",
-            options=[
-                "Fixed salary bands with no negotiation",
-                "Negotiation based on candidate's current salary",
-                "Negotiation based on market rates",
-                "Negotiation based on skills assessment",
-                "Other approach"
-            ]
-        )
+def show_hr_survey():
+    st.title(HR_SURVEY.title)
+    
+    with st.form("hr_survey_form"):
+        answers = {question.column: survey_input(question) for question in HR_SURVEY.questions}
         
         submitted = st.form_submit_button("Submit Survey")
         
-        if submitted:
-            save_survey(location, department, hiring_time, fair_strategies, rehire, payment_negotiation)
+        if submitted and save_survey(answers):
             # Automatically show the dashboard after submission
             st.rerun()
 
-def show_hr_dashboard():
+@st.cache_resource(show_spinner=False)
+def load_world():
+    # Natural Earth country shapes, downloaded once per process
+    url = "https://naciscdn.org/naturalearth/110m/cultural/ne_110m_admin_0_countries.zip"
+    world = gpd.read_file(url)
+    world = world.rename(columns={column: column.upper() for column in world.columns if column != 'geometry'})
+    world['ISO3'] = natural_earth_codes(world)
+    get_country_index().attach_world(world)
+    return world
+
+def show_survey_filters(cube):
+    # Filter widgets slice the pre-aggregated cube, so every chart updates without rescanning rows
+    with st.expander("Filter responses", expanded=False):
+        questions = [question for question in HR_SURVEY.questions if question.filter]
+        filters = {
+            question.column: column.multiselect(question.short, cube.options(question.column))
+            for question, column in zip(questions, st.columns(len(questions)))
+        }
+    return {column: values for column, values in filters.items() if values}
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def survey_bar_figure(counts, column):
+    # Keyed by the counts themselves, so unchanged charts are not rebuilt on live refreshes
+    return count_bar_figure(counts, column)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def location_map_png(code_counts):
+    world = load_world()
+    merged = world.set_index('ISO3').join(code_counts.rename('Count'))
+    
+    fig, ax = plt.subplots(figsize=(10, 6))
+    merged.plot(column='Count', ax=ax, legend=True,
+                missing_kwds={"color": "lightgrey"},
+                cmap='Blues')
+    plt.title('Respondent Locations')
+    png = io.BytesIO()
+    fig.savefig(png, format='png', bbox_inches='tight')
+    plt.close(fig)
+    return png.getvalue()
+
+def show_hr_dashboard(live=False):
     st.title("Survey Results: Gig-Hiring Practices Around The Globe")
     
     # Always show the dashboard, even with empty data
-    if st.session_state.hr_survey_data.empty:
+    state = get_survey_state()
+    if state.rows == 0:
         st.warning("No survey data available yet. Please complete the survey to see analytics.")
         return
     
+    filters = show_survey_filters(state.cube)
+    if live:
+        st.caption(f"🔴 Live: new responses appear within {LIVE_REFRESH_SECONDS} seconds.")
+        show_live_survey_results(filters)
+    else:
+        show_survey_results(filters)
+    show_crosstab_panel(state, filters)
+
+def show_survey_results(filters):
+    cube = get_survey_state().cube
+    if cube.total(filters) == 0:
+        st.info("No survey responses match the selected filters.")
+        return
+    
     # Display basic stats
     st.subheader("Survey Responses Overview")
     col1, col2, col3 = st.columns(3)
-    col1.metric("Total Responses", len(st.session_state.hr_survey_data))
-    col2.metric("Unique Countries", st.session_state.hr_survey_data['location'].nunique())
-    col3.metric("Departments Represented", st.session_state.hr_survey_data['department'].nunique())
+    col1.metric("Total Responses", cube.total(filters))
+    col2.metric("Unique Countries", int((cube.marginal('location', filters) > 0).sum()))
+    col3.metric("Departments Represented", int((cube.marginal('department', filters) > 0).sum()))
     
     # Create two columns for better layout
     col1, col2 = st.columns(2)
@@ -127,346 +167,143 @@ def show_hr_dashboard():
     with col1:
         # Location distribution
         st.subheader("Respondent Locations")
-        country_counts = st.session_state.hr_survey_data['location'].value_counts().reset_index()
+        country_counts = cube.marginal('location', filters)
+        country_counts = country_counts[country_counts > 0].sort_values(ascending=False).reset_index()
         country_counts.columns = ['Country', 'Count']
         
         try:
             # Try to plot a map (may not work in all environments)
-            url = "https://naciscdn.org/naturalearth/110m/cultural/ne_110m_admin_0_countries.zip"
-
-            world = gpd.read_file(url)
-            # world = gpd.read_file(gpd.datasets.get_path('naturalearth_lowres'))
-            merged = world.set_index('name').join(country_counts.set_index('Country'))
-            
-            fig, ax = plt.subplots(figsize=(10, 6))
-            merged.plot(column='Count', ax=ax, legend=True,
-                        missing_kwds={"color": "lightgrey"},
-                        cmap='Blues')
-            plt.title('Respondent Locations')
-            st.pyplot(fig)
+            # Join on ISO-3 codes so pycountry names like "Viet Nam" match Natural Earth's "Vietnam"
+            code_counts = country_counts.groupby(country_counts['Country'].map(get_country_index().code_for))['Count'].sum()
+            st.image(location_map_png(code_counts), use_container_width=True)
+            # UN regions come from the map geometry, so they are only known once it has loaded
+            region_counts = country_counts.groupby(country_counts['Country'].map(get_country_index().region_for))['Count'].sum()
+            if not region_counts.empty:
+                st.caption("By region: " + ", ".join(
+                    f"{region} {count}" for region, count in region_counts.sort_values(ascending=False).items()))
         except Exception as e:
             # st.warning(f"Map visualization unavailable: {str(e)}")
             st.bar_chart(country_counts.set_index('Country'))
-        
-        # Fair strategies analysis
-        st.subheader("Fair Hiring Strategies Used")
-        if 'fair_strategies' in st.session_state.hr_survey_data.columns:
-            all_strategies = []
-            for strategies in st.session_state.hr_survey_data['fair_strategies']:
-                if pd.notna(strategies) and isinstance(strategies, str):
-                    all_strategies.extend([s.strip() for s in strategies.split(',')])
-            
-            if all_strategies:
-                strategy_counts = pd.Series(all_strategies).value_counts().reset_index()
-                # st.bar_chart(strategy_counts) #, color = ["#2d00f7","#6a00f4","#8900f2","#bc00dd","#e500a4","#f20089","#ffb600"])
-                strategy_counts.columns = ['Strategy', 'Count']
-            
-                colors = ["#ea6016","#f3712b","#f58b51","#f0e3dd","#fc9cb5","#fa4274","#df3764"]
-                
-                fig = px.bar(strategy_counts, x='Strategy', y='Count',
-                            color='Strategy',
-                            color_discrete_sequence=colors[:len(strategy_counts)],
-                            )
-                
-                fig.update_traces(textposition='outside')
-                fig.update_layout(
-                    xaxis_title='Strategy',
-                    yaxis_title='Frequency',
-                    showlegend=False
-                )
-                st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.warning("No strategies data available")
-            
-        # Payment negotiation analysis
-        st.subheader("Approaches for Payment Negotiation with Gig Workers")
-        if 'payment_negotiation' in st.session_state.hr_survey_data.columns:
-            payment_counts = st.session_state.hr_survey_data['payment_negotiation'].value_counts().reset_index()
-            payment_counts.columns = ['Payment-Negotiation', 'Count']
-            
-            colors = ["#ff1b6b","#e03884","#c1559c","#a273b5","#8390ce","#64ade6","#45caff"]
-            fig = px.bar(payment_counts, x='Payment-Negotiation', y='Count',
-                            color='Payment-Negotiation',
-                            color_discrete_sequence=colors[:len(payment_counts)],
-                            )
-            fig.update_traces(textposition='outside')
-            fig.update_layout(
-                xaxis_title='Payment-Negotiation',
-                yaxis_title='Frequency',
-                showlegend=False
-            )
-            st.plotly_chart(fig, use_container_width=True)
-            # st.bar_chart(payment_counts) #, color = ["#40c9ff","#5cacff","#788fff","#9473ff","#b056ff","#cc39ff","#e81cff"])
-        else:
-            st.warning("No payment negotiation data available")
     
-    with col2:   
-        # Department distribution
-        st.subheader("Department Distribution")
-        if st.session_state.hr_survey_data['department'].nunique() > 0:
-            colors = ["#5de0f0","#77d6f1","#90cdf2","#aac3f3","#c4b9f3","#ddb0f4","#f7a6f5"]
-            dept_counts = st.session_state.hr_survey_data['department'].value_counts().reset_index()
-            dept_counts.columns = ['Departments', 'Count']
-            
-            fig = px.bar(dept_counts, x='Departments', y='Count',
-                            color='Departments',
-                            color_discrete_sequence=colors[:len(dept_counts)],
-                            )
-            fig.update_traces(textposition='outside')
-            fig.update_layout(
-                xaxis_title='Participation of HR Departments in the Survey',
-                yaxis_title='Frequency',
-                showlegend=False
-            )
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.warning("No department data available")
+    for column_charts, layout_column in zip(SURVEY_CHART_LAYOUT, (col1, col2)):
+        with layout_column:
+            for column in column_charts:
+                st.subheader(SURVEY_CHARTS[column]['title'])
+                counts = chart_counts(cube, column, filters)
+                if counts.empty:
+                    st.warning(SURVEY_CHARTS[column]['empty'])
+                    continue
+                st.plotly_chart(survey_bar_figure(counts, column), use_container_width=True)
+
+# Live mode reruns only the results below the filters, on a timer
+show_live_survey_results = st.fragment(run_every=LIVE_REFRESH_SECONDS)(show_survey_results)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def survey_crosstab(_cube, version, row, column, filter_items):
+    # Keyed by the state's version, so switching pairs back and forth is a cache hit
+    table = _cube.crosstab(row, column, dict(filter_items))
+    return table, chi_square(table.values)
+
+def show_crosstab_panel(state, filters):
+    # Single-answer questions only: multi-select answers aren't exclusive, so chi-square doesn't apply
+    questions = {question.short: question.column for question in HR_SURVEY.questions
+                 if question.column in HR_SURVEY.single_columns}
+    with st.expander("Compare two questions", expanded=False):
+        col1, col2, col3 = st.columns([2, 2, 1])
+        row = col1.selectbox("Rows", list(questions), index=1, key="crosstab_rows")
+        column = col2.selectbox("Columns", list(questions), index=len(questions) - 1, key="crosstab_columns")
+        shares = col3.toggle("Row shares", key="crosstab_shares")
+        if row == column:
+            st.info("Choose two different questions to compare.")
+            return
+        
+        filter_items = tuple((name, tuple(values)) for name, values in sorted(filters.items()))
+        table, test = survey_crosstab(state.cube, state.version, questions[row], questions[column], filter_items)
+        if test.dof == 0:
+            st.info("Not enough distinct answers among the selected responses to compare these questions.")
+            return
+        
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Chi-square", f"{test.statistic:.1f}", help=f"{test.dof} degrees of freedom")
+        col2.metric("p-value", f"{test.p_value:.3g}")
+        col3.metric("Cramér's V", f"{test.cramers_v:.2f}", help="Strength of association, from 0 (none) to 1")
+        col4.metric("Responses", test.responses)
+        if test.sparse_share > 0.2:
+            st.warning(f"{test.sparse_share:.0%} of cells expect fewer than 5 responses, so the p-value is only a rough guide.")
+        
+        table = table.loc[table.sum(axis=1) > 0, table.sum(axis=0) > 0]
+        values = table.div(table.sum(axis=1), axis=0) if shares else table
+        fig = px.imshow(values, text_auto='.0%' if shares else True, aspect='auto', color_continuous_scale='Blues',
+                        labels={'x': column, 'y': row, 'color': 'Share' if shares else 'Responses'})
+        st.plotly_chart(fig, use_container_width=True)
+
+def show_hr_trends():
+    st.title("Survey Trends Over Time")
     
-        # Hiring time analysis
-        st.subheader("Hiring Time Analysis")
-        if 'hiring_time' in st.session_state.hr_survey_data.columns:
-            hiring_time_order = ["Less than 1 week", "1-2 weeks", "2-4 weeks", "1-2 months", "More than 2 months"]
-            hiring_counts = st.session_state.hr_survey_data['hiring_time'].value_counts().reindex(hiring_time_order).reset_index()
-            hiring_counts.columns = ['Hiring_Time', 'Count']
-            
-            colors = ["#ff0f7b","#fd3e60","#fc5552","#fa6c44","#f89b29"]
-            fig = px.bar(hiring_counts, x='Hiring_Time', y='Count',
-                            color='Hiring_Time',
-                            color_discrete_sequence=colors[:len(hiring_counts)],
-                            )
-            fig.update_traces(textposition='outside')
-            fig.update_layout(
-                xaxis_title='Global Average Hiring Time For Gig Workers',
-                yaxis_title='Frequency',
-                showlegend=False
-            )
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # st.bar_chart(hiring_counts)
-        else:
-            st.warning("No hiring time data available")
+    trends = get_survey_state().trends
+    date_range = trends.date_range()
+    if date_range is None:
+        st.warning("No timestamped survey responses available yet.")
+        return
     
-        # Rehire analysis
-        st.subheader("Organizational Policies on Re-Hiring Former Gig Workers")
-        if 'rehire' in st.session_state.hr_survey_data.columns:
-            rehire_order = ["Yes, frequently", "Occasionally", "Rarely", "Never"]
-            rehire_counts = st.session_state.hr_survey_data['rehire'].value_counts().reindex(rehire_order).reset_index()
-            rehire_counts.columns = ['Rehire-Decision', 'Count']
-            
-            colors = ["#fff1bf","#f69ba6", "#ef6295","#ec458d"]
-            fig = px.bar(rehire_counts, x='Rehire-Decision', y='Count',
-                            color='Rehire-Decision',
-                            color_discrete_sequence=colors[:len(rehire_counts)],
-                            )
-            fig.update_traces(textposition='outside')
-            fig.update_layout(
-                xaxis_title='Rehire-Decision',
-                yaxis_title='Frequency',
-                showlegend=False
-            )
-            st.plotly_chart(fig, use_container_width=True)
-            # st.bar_chart(rehire_counts) #, color = ["#fff1bf","#f69ba6", "#ef6295","#ec458d"])
-        else:
-            st.warning("No rehire data available")
+    col1, col2 = st.columns([1, 2])
+    frequency = col1.radio("Group responses by", list(TREND_FREQUENCIES), horizontal=True)
+    first, last = date_range[0].date(), date_range[1].date()
+    selected = col2.date_input("Date range", value=(first, last), min_value=first, max_value=last)
+    if len(selected) != 2:
+        st.info("Select an end date to update the trends.")
+        return
+    start = pd.Timestamp(selected[0])
+    end = pd.Timestamp(selected[1]) + pd.Timedelta(days=1)
     
+    st.metric("Responses in Selected Range", trends.count_between(start, end))
     
+    # Responses per bucket
+    st.subheader(f"Responses per {frequency}")
+    response_counts = trends.response_series(frequency, start, end).reset_index()
+    response_counts.columns = ['Period', 'Responses']
+    fig = px.bar(response_counts, x='Period', y='Responses', color_discrete_sequence=["#fa4274"])
+    fig.update_layout(xaxis_title='Period', yaxis_title='Responses', showlegend=False)
+    st.plotly_chart(fig, use_container_width=True)
     
-    # # Raw data
-    # if st.checkbox("Show raw data"):
-    #     st.write(st.session_state.hr_survey_data)
+    # Answer distribution shift
+    st.subheader("How Answers Shift Over Time")
+    questions = {
+        question.short: question.column
+        for question in HR_SURVEY.questions if question.column in HR_SURVEY.trend_columns
+    }
+    question = st.selectbox("Question", list(questions))
+    answers = trends.answer_frame(frequency, questions[question], start, end)
+    if answers.empty:
+        st.info("No answers recorded for this question in the selected range.")
+        return
+    # Share of answers within each bucket, so busy and quiet periods are comparable
+    shares = answers.div(answers.sum(axis=1).replace(0, 1), axis=0) * 100
+    shares = shares.reset_index(names='Period').melt(id_vars='Period', var_name='Answer', value_name='Share')
+    fig = px.area(shares, x='Period', y='Share', color='Answer')
+    fig.update_layout(
+        xaxis_title='Period',
+        yaxis_title='Share of Answers (%)',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    st.plotly_chart(fig, use_container_width=True)
 
 def hr_survey_page():
     """Main function to be called from your app's navigation"""
-    tab1, tab2 = st.tabs(["📝 Take Survey", "📊 Survey Results"])
+    tab1, tab2, tab3 = st.tabs(["📝 Take Survey", "📊 Survey Results", "📈 Trends"])
     
     with tab1:
         show_hr_survey()
         
     with tab2:
-        show_hr_dashboard()
-        
-        
-# import streamlit as st
-# import pandas as pd
-# import matplotlib.pyplot as plt
-# import geopandas as gpd
-# import pycountry
-# from datetime import datetime
-# import os
-
-# # Initialize session state for data storage if not already present
-# if 'hr_survey_data' not in st.session_state:
-#     st.session_state.hr_survey_data = pd.DataFrame(columns=[
-#         'timestamp', 'location', 'department', 
-#         'hiring_time', 'fair_strategies', 'rehire', 'payment_negotiation'
-#     ])
-
-# # Function to save survey data
-# def save_survey(location, department, hiring_time, fair_strategies, rehire, payment_negotiation):
-#     new_entry = {
-#         'timestamp': datetime.now(),
-#         'location': location,
-#         'department': department,
-#         'hiring_time': hiring_time,
-#         'fair_strategies': fair_strategies,
-#         'rehire': rehire,
-#         'payment_negotiation': payment_negotiation
-#     }
-    
-#     # Convert to DataFrame and append
-#     new_df = pd.DataFrame([new_entry])
-#     st.session_state.hr_survey_data = pd.concat([st.session_state.hr_survey_data, new_df], ignore_index=True)
-    
-#     # Save to CSV
-#     if not os.path.exists('hr_survey_data.csv'):
-#         st.session_state.hr_survey_data.to_csv('hr_survey_data.csv', index=False)
-#     else:
-#         st.session_state.hr_survey_data.to_csv('hr_survey_data.csv', mode='a', header=False, index=False)
-
-# # Function to load existing data
-# @st.cache_data
-# def load_hr_data():
-#     if os.path.exists('hr_survey_data.csv'):
-#         return pd.read_csv('hr_survey_data.csv')
-#     return pd.DataFrame()
-
-# def show_hr_survey():
-#     st.title("HR Hiring Practices For Gig Workers: Survey")
-    
-#     with st.form("hr_survey_form"):
-#         # Location input
-#         country_names = [country.name for country in pycountry.countries]
-#         location = st.selectbox("Select your location/country:", sorted(country_names))
-        
-#         # Department selection
-#         departments = [
-#             "Recruitment", "Training", "Onboarding", "Hiring", 
-#             "Compensation", "Employee Relations", "Talent Management"
-#         ]
-#         department = st.selectbox("Select your HR department:", departments)
-        
-#         # Question 1: Hiring time
-#         hiring_time = st.select_slider(
-#             "1. How long does your organization typically take to hire gig workers?",
-#             options=["Less than 1 week", "1-2 weeks", "2-4 weeks", "1-2 months", "More than 2 months"]
-#         )
-        
-#         # Question 2: Fair hiring strategies
-#         fair_strategies = st.multiselect(
-#             "2. What strategies does your organization use to make the hiring process fair? (Select all that apply)",
-#             options=[
-#                 "Blind resume screening",
-#                 "Structured interviews",
-#                 "Diverse hiring panels",
-#                 "Skills-based assessments",
-#                 "Standardized evaluation criteria",
-#                 "Bias training for interviewers",
-#                 "Other"
-#             ]
-#         )
+        interactive = st.toggle("Interactive dashboard with filters", key="survey_interactive")
+        if interactive:
+            live = st.toggle("Live updates", key="survey_live",
+                             help="Poll for new responses and update the charts without reloading the page")
+            show_hr_dashboard(live=live)
+        elif not show_snapshot('survey-results'):
+            show_hr_dashboard()
+        show_export_panel(SURVEY_FILE, "survey responses", key='survey_export')
         
-#         # Question 3: Re-hiring
-#         rehire = st.radio(
-#             "3. Does your organization actively re-hire former gig workers?",
-#             options=["Yes, frequently", "Occasionally", "Rarely", "Never"]
-#         )
-        
-#         # Question 4: Payment negotiation
-#         payment_negotiation = st.selectbox(
-#             "4. How does your organization typically negotiate with gig workers and decide on payment?",
-#             options=[
-#                 "Fixed salary bands with no negotiation",
-#                 "Negotiation based on candidate's current payments",
-#                 "Negotiation based on market rates",
-#                 "Negotiation based on skills assessment",
-#                 "Other approach"
-#             ]
-#         )
-        
-#         submitted = st.form_submit_button("Submit Survey")
-        
-#         if submitted:
-#             save_survey(location, department, hiring_time, ", ".join(fair_strategies), rehire, payment_negotiation)
-#             st.success("Thank you for completing the survey!")
-
-# def show_hr_dashboard():
-#     st.title("HR Hiring Practices For Gig Workers: Survey Results")
-#     existing_data = load_hr_data()
-#     # # Load data if not in session state
-#     # if st.session_state.hr_survey_data.empty:
-#     #     existing_data = load_hr_data()
-#     #     if not existing_data.empty:
-#     #         st.session_state.hr_survey_data = existing_data
-    
-#     # if st.session_state.hr_survey_data.empty:
-#     #     st.warning("No survey data available yet. Please complete the survey first.")
-#     # return
-        
-    
-#     # Display basic stats
-#     st.subheader("Survey Responses Overview")
-#     col1, col2, col3 = st.columns(3)
-#     col1.metric("Total Responses", len(st.session_state.hr_survey_data))
-#     col2.metric("Unique Countries", st.session_state.hr_survey_data['location'].nunique())
-#     col3.metric("Departments Represented", st.session_state.hr_survey_data['department'].nunique())
-    
-#     # Location distribution
-#     st.subheader("Respondent Locations")
-#     country_counts = st.session_state.hr_survey_data['location'].value_counts().reset_index()
-#     country_counts.columns = ['Country', 'Count']
-    
-#     try:
-#         # Try to plot a map (may not work in all environments)
-#         world = gpd.read_file(gpd.datasets.get_path('naturalearth_lowres'))
-#         merged = world.set_index('name').join(country_counts.set_index('Country'))
-        
-#         fig, ax = plt.subplots(figsize=(10, 6))
-#         merged.plot(column='Count', ax=ax, legend=True,
-#                     missing_kwds={"color": "lightgrey"},
-#                     cmap='Blues')
-#         plt.title('Respondent Locations')
-#         st.pyplot(fig)
-#     except:
-#         # Fallback to bar chart if map doesn't work
-#         st.bar_chart(country_counts.set_index('Country'))
-    
-#     # Department distribution
-#     st.subheader("Department Distribution")
-#     dept_counts = st.session_state.hr_survey_data['department'].value_counts()
-#     fig, ax = plt.subplots()
-#     dept_counts.plot(kind='pie', autopct='%.0f%%', textprops={'size': 'smaller'}, radius=0.5, ax=ax)
-#     ax.set_ylabel('')
-#     st.pyplot(fig)
-    
-#     # Hiring time analysis
-#     st.subheader("Hiring Time Analysis")
-#     hiring_time_order = ["Less than 1 week", "1-2 weeks", "2-4 weeks", "1-2 months", "More than 2 months"]
-#     hiring_counts = st.session_state.hr_survey_data['hiring_time'].value_counts().reindex(hiring_time_order)
-#     st.bar_chart(hiring_counts)
-    
-#     # Fair strategies analysis
-#     st.subheader("Fair Hiring Strategies Used")
-#     # Split multi-select answers and count occurrences
-#     all_strategies = []
-#     for strategies in st.session_state.hr_survey_data['fair_strategies']:
-#         if isinstance(strategies, str):
-#             all_strategies.extend([s.strip() for s in strategies.split(',')])
-    
-#     strategy_counts = pd.Series(all_strategies).value_counts()
-#     st.bar_chart(strategy_counts)
-    
-#     # Rehire analysis
-#     st.subheader("Re-Hiring Practices")
-#     rehire_order = ["Yes, frequently", "Occasionally", "Rarely", "Never"]
-#     rehire_counts = st.session_state.hr_survey_data['rehire'].value_counts().reindex(rehire_order)
-#     st.bar_chart(rehire_counts)
-    
-#     # Payment negotiation analysis
-#     st.subheader("Payment Negotiation Approaches")
-#     payment_counts = st.session_state.hr_survey_data['payment_negotiation'].value_counts()
-#     st.bar_chart(payment_counts)
-    
-#     # Raw data
-#     if st.checkbox("Show raw data"):
-#         st.write(st.session_state.hr_survey_data)
-
+    with tab3:
+        show_hr_trends()
@@ -0,0 +1,343 @@
+"""Pre-rendered static snapshots of the read-mostly pages.
+
+Usage:
+    python report_snapshots.py            # render pages whose data changed
+    python report_snapshots.py --watch 30 # keep re-rendering every 30 seconds
+
+Each page is rendered to HTML (plotly, loaded from the CDN) and to PDF
+(reportlab) on a process pool. Files land in static/snapshots/ together with a
+manifest recording the data version they were built from, so the app can
+hand read-only visitors the snapshot with a single file read.
+
+Only one renderer runs at a time, across processes and replicas sharing the
+directory: it holds render.lock, and before exiting re-checks the data
+versions and renders again if they moved while it was busy. A renderer that
+finds the lock taken exits at once, leaving the work to the running one.
+"""
+import argparse
+import contextlib
+import hashlib
+import html
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows: renders are not serialized across processes
+    fcntl = None
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+import streamlit.components.v1 as components
+
+import compass
+from data_paths import APP_DIR, SURVEY_FILE
+from survey_charts import SURVEY_CHARTS, SURVEY_CHART_LAYOUT, chart_counts, count_bar_figure
+from survey_cube import SurveyCube
+
+SNAPSHOT_DIR = os.path.join(APP_DIR, 'static', 'snapshots')
+MANIFEST = os.path.join(SNAPSHOT_DIR, 'manifest.json')
+RENDER_LOCK = os.path.join(SNAPSHOT_DIR, 'render.lock')
+# After a renderer fails, the app waits this long before starting another
+RENDER_RETRY_SECONDS = 60
+
+PAGE_TITLES = {
+    'survey-results': "Survey Results: Gig-Hiring Practices Around The Globe",
+    'compass': "Global HR Compass",
+}
+
+
+def file_version(path):
+    # Cheap version of a data file: changes whenever it is rewritten or appended to
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return 'missing'
+    return hashlib.sha1(f"{stat.st_size}-{stat.st_mtime_ns}".encode('utf-8')).hexdigest()[:12]
+
+
+def page_version(page):
+    if page == 'survey-results':
+        return file_version(SURVEY_FILE)
+    return compass.COMPASS_VERSION
+
+
+# --- Rendering (runs in worker processes) ---
+
+def _html_page(title, sections):
+    body = []
+    for heading, content in sections:
+        body.append(f"<h3>{html.escape(heading)}</h3>" if heading else "")
+        body.append(content)
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+        f"<title>{html.escape(title)}</title>"
+        "<style>body{font-family:sans-serif;margin:1rem} .metrics{display:flex;gap:3rem}"
+        " .metrics div{font-size:1.6rem} .metrics span{display:block;font-size:.85rem;color:#666}</style>"
+        f"</head><body><h1>{html.escape(title)}</h1>{''.join(body)}</body></html>"
+    )
+
+
+def _figure_html(fig, first=False):
+    # Only the first figure on a page loads plotly.js (matching the installed plotly version)
+    return fig.to_html(full_html=False, include_plotlyjs='cdn' if first else False)
+
+
+def _survey_summary():
+    # Headline metrics and per-chart counts of the results page, from a freshly built cube
+    cube = SurveyCube.from_frame(pd.read_csv(SURVEY_FILE))
+    metrics = [
+        ("Total Responses", cube.total()),
+        ("Unique Countries", int((cube.marginal('location') > 0).sum())),
+        ("Departments Represented", int((cube.marginal('department') > 0).sum())),
+    ]
+    country_counts = cube.marginal('location')
+    charts = [(None, "Respondent Locations", country_counts[country_counts > 0].sort_values(ascending=False))]
+    for column in SURVEY_CHART_LAYOUT[0] + SURVEY_CHART_LAYOUT[1]:
+        charts.append((column, SURVEY_CHARTS[column]['title'], chart_counts(cube, column)))
+    return metrics, [chart for chart in charts if not chart[2].empty]
+
+
+def render_html(page, path):
+    if page == 'survey-results':
+        metrics, charts = _survey_summary()
+        sections = [("Survey Responses Overview", "<div class='metrics'>" + "".join(
+            f"<div><span>{label}</span>{value}</div>" for label, value in metrics
+        ) + "</div>")]
+        for i, (column, heading, counts) in enumerate(charts):
+            if column is None:
+                data = counts.reset_index()
+                data.columns = ['Country', 'Count']
+                fig = px.bar(data, x='Country', y='Count')
+            else:
+                fig = count_bar_figure(counts, column)
+            sections.append((heading, _figure_html(fig, first=i == 0)))
+    else:
+        style = compass.DEFAULT_CHART_STYLE
+        practice = compass.PRACTICE_TOPIC_WEIGHTS["HRM Practices"][0]
+        topics = "".join(
+            f"<p><b>{html.escape(name)}</b>: {html.escape(text)}</p>"
+            for name, text in compass.DISCOURSE_TOPICS.items()
+        )
+        sections = [
+            ("Which HRM Practices are the most important for managing gig workers?", _figure_html(
+                compass.practice_frequency_figure(style['axis_title_font_size'], style['axis_tick_font_size']),
+                first=True)),
+            ("HRM Practices Longitudnal Evolution", _figure_html(compass.practice_evolution_figure(**style))),
+            (f"How is {practice} related to the discussion topics?", _figure_html(compass.topic_radar_figure(practice))),
+            ("Discourse Topics", topics),
+        ]
+    with open(path, 'w', encoding='utf-8') as out:
+        out.write(_html_page(PAGE_TITLES[page], sections))
+
+
+def _pdf_bar_chart(counts):
+    from reportlab.graphics.charts.barcharts import HorizontalBarChart
+    from reportlab.graphics.shapes import Drawing
+
+    labels = [str(label) for label in counts.index][::-1]
+    drawing = Drawing(460, 24 * len(labels) + 30)
+    chart = HorizontalBarChart()
+    chart.x, chart.y = 200, 15
+    chart.width, chart.height = 240, 24 * len(labels)
+    chart.data = [[int(value) for value in counts.values][::-1]]
+    chart.categoryAxis.categoryNames = [label if len(label) < 40 else label[:37] + '...' for label in labels]
+    chart.categoryAxis.labels.fontSize = 7
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.labels.fontSize = 7
+    drawing.add(chart)
+    return drawing
+
+
+def render_pdf(page, path):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+    styles = getSampleStyleSheet()
+    story = [Paragraph(html.escape(PAGE_TITLES[page]), styles['Title'])]
+
+    if page == 'survey-results':
+        metrics, charts = _survey_summary()
+        story.append(Paragraph("Survey Responses Overview", styles['Heading3']))
+        for label, value in metrics:
+            story.append(Paragraph(f"{label}: <b>{value}</b>", styles['Normal']))
+        for _, heading, counts in charts:
+            story.append(Paragraph(html.escape(heading), styles['Heading3']))
+            story.append(_pdf_bar_chart(counts))
+            story.append(Spacer(1, 8))
+    else:
+        frequency = pd.Series(compass.PRACTICE_FREQUENCY["Frequency"], index=compass.PRACTICE_FREQUENCY["HRM Practices"])
+        story.append(Paragraph("Most important HRM Practices for managing gig workers", styles['Heading3']))
+        story.append(_pdf_bar_chart(frequency))
+        evolution = pd.DataFrame(compass.PRACTICE_EVOLUTION).set_index('Year').sum()
+        story.append(Paragraph("HRM Practices discussed 2009-2024 (total occurrences)", styles['Heading3']))
+        story.append(_pdf_bar_chart(evolution.sort_values(ascending=False)))
+        story.append(Paragraph("Discourse Topics", styles['Heading3']))
+        for name, text in compass.DISCOURSE_TOPICS.items():
+            # The built-in PDF fonts have no emoji glyphs
+            name = name.encode('ascii', 'ignore').decode().strip()
+            story.append(Paragraph(f"<b>{html.escape(name)}</b>: {html.escape(text)}", styles['Normal']))
+            story.append(Spacer(1, 4))
+
+    SimpleDocTemplate(path, pagesize=A4, title=PAGE_TITLES[page]).build(story)
+
+
+def _render(page, fmt, version, owner):
+    # Temporary name unique to the renderer run, so concurrent runs never share a file
+    path = os.path.join(SNAPSHOT_DIR, f"{page}-{version}-{owner}.{fmt}")
+    (render_html if fmt == 'html' else render_pdf)(page, path)
+    return page, fmt, path
+
+
+# --- Orchestration ---
+
+def load_manifest():
+    try:
+        with open(MANIFEST, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def stale_pages(pages=None):
+    manifest = load_manifest()
+    return [page for page in (pages or PAGE_TITLES) if manifest.get(page, {}).get('version') != page_version(page)]
+
+
+@contextlib.contextmanager
+def render_lock():
+    """Yield True while holding the renderer lock, or False if another process holds it."""
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    if fcntl is None:
+        yield True
+        return
+    with open(RENDER_LOCK, 'a') as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def render_snapshots(pages=None, workers=None, force=False):
+    """Render every page whose data version differs from the manifest.
+
+    Call with the renderer lock held. Returns the list of pages that were
+    re-rendered.
+    """
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    manifest = load_manifest()
+    versions = {page: page_version(page) for page in (pages or PAGE_TITLES)}
+    stale = [page for page, version in versions.items()
+             if force or manifest.get(page, {}).get('version') != version]
+    if not stale:
+        return []
+
+    tasks = [(page, fmt, versions[page], os.getpid()) for page in stale for fmt in ('html', 'pdf')]
+    with ProcessPoolExecutor(max_workers=workers or min(len(tasks), os.cpu_count() or 1)) as pool:
+        results = list(pool.map(_render, *zip(*tasks)))
+
+    for page, fmt, path in results:
+        # Stable names for serving; os.replace keeps readers from seeing a partial file
+        os.replace(path, os.path.join(SNAPSHOT_DIR, f"{page}.{fmt}"))
+    for page in stale:
+        manifest[page] = {'version': versions[page], 'rendered_at': time.time()}
+    partial = f"{MANIFEST}.{os.getpid()}.part"
+    with open(partial, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(partial, MANIFEST)
+    return stale
+
+
+# --- Serving (inside the Streamlit app) ---
+
+_renderer_lock = threading.Lock()
+_renderer = None  # this process's last renderer subprocess
+
+
+def request_render():
+    """Start the offline renderer in the background unless one is already running.
+
+    A running renderer (from this process, the warm-up or another replica)
+    picks up the new data version itself before it exits, and a failed one
+    is retried after RENDER_RETRY_SECONDS rather than on every rerun.
+    """
+    global _renderer
+    with _renderer_lock:
+        if _renderer is not None:
+            process, started = _renderer
+            if process.poll() is None:
+                return
+            if process.returncode != 0 and time.monotonic() - started < RENDER_RETRY_SECONDS:
+                return
+        with render_lock() as free:
+            if not free:
+                return
+        process = subprocess.Popen([sys.executable, os.path.join(APP_DIR, 'report_snapshots.py')], cwd=APP_DIR)
+        _renderer = (process, time.monotonic())
+
+
+def fresh_snapshot(page):
+    # Path of the page's HTML snapshot if it matches the current data, else None
+    entry = load_manifest().get(page)
+    path = os.path.join(SNAPSHOT_DIR, f"{page}.html")
+    if entry and entry.get('version') == page_version(page) and os.path.exists(path):
+        return path
+    return None
+
+
+def show_snapshot(page, height=2200):
+    """Serve the pre-rendered snapshot of `page`; returns False if none is fresh.
+
+    Read-only visitors get the snapshot, and the live page is only built on
+    request. A stale or missing snapshot triggers a background re-render, and
+    the caller falls back to building the live page for this visitor.
+    """
+    path = fresh_snapshot(page)
+    if path is None:
+        request_render()
+        return False
+    with open(path, encoding='utf-8') as f:
+        components.html(f.read(), height=height, scrolling=True)
+    st.markdown(f"[📄 Download this page as PDF](app/static/snapshots/{page}.pdf)")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render static snapshots of the read-mostly pages.")
+    parser.add_argument('--watch', type=float, default=None, metavar='SECONDS',
+                        help="keep checking the data version at this interval")
+    parser.add_argument('--force', action='store_true', help="re-render even if the data is unchanged")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    while True:
+        while True:
+            with render_lock() as acquired:
+                if not acquired:
+                    break  # The running renderer re-checks the versions when it is done
+                rendered = render_snapshots(workers=args.workers, force=args.force)
+                args.force = False
+            if rendered:
+                print(f"Rendered snapshots: {', '.join(rendered)}")
+            # Data may have changed while we rendered, and that run's renderer found the lock taken
+            if not stale_pages():
+                break
+        if args.watch is None:
+            break
+        time.sleep(args.watch)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""Opt-in cProfile of a single script rerun.
+
+Profiling is off unless one of these is set:
+    GIRAMISU_PROFILE=1              profile every rerun (local debugging)
+    GIRAMISU_PROFILE_TOKEN=<secret> profile reruns opened with ?profile=<secret>
+
+Each profiled rerun is saved to profiles/ as a .prof file named after the
+page, loadable with `python -m pstats` or snakeviz, and its hottest functions
+are listed at the bottom of the page. Reruns cut short by st.rerun(),
+st.stop() or an exception are saved too, labelled with how they ended.
+
+Only one rerun per process is profiled at a time: from Python 3.12
+cProfile hooks sys.monitoring, which is process-wide, so two sessions'
+profiles would mix (or the second enable() would fail). A rerun that
+asks while another is being profiled runs unprofiled.
+"""
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+
+from data_paths import APP_DIR
+
+PROFILE_DIR = os.path.join(APP_DIR, 'profiles')
+TOP_FUNCTIONS = 25
+
+_profiling = threading.Lock()
+
+
+def profiling_requested():
+    if os.environ.get('GIRAMISU_PROFILE') == '1':
+        return True
+    token = os.environ.get('GIRAMISU_PROFILE_TOKEN')
+    given = st.query_params.get('profile')
+    # Constant-time comparison, so the token can't be guessed a character at a time
+    return bool(token and given and hmac.compare_digest(given, token))
+
+
+class RerunProfile:
+    """Handle yielded by `profiled_rerun`; the script sets `page` once it knows it."""
+
+    def __init__(self):
+        self.page = 'page'
+        self.profiler = None
+
+
+@contextmanager
+def profiled_rerun():
+    """Profile the enclosed script body if an admin asked for it.
+
+    The profile is stopped, saved and shown in `finally`, so reruns ended by
+    st.rerun(), st.stop() or an uncaught exception are not lost (and never
+    leave the profiler running).
+    """
+    profile = RerunProfile()
+    busy = False
+    if profiling_requested():
+        if _profiling.acquire(blocking=False):
+            profile.profiler = cProfile.Profile()
+            profile.profiler.enable()
+        else:
+            busy = True
+    outcome = None
+    try:
+        yield profile
+    except BaseException as e:
+        # Streamlit's RerunException / StopException, or a crash on the page
+        outcome = type(e).__name__
+        raise
+    finally:
+        if profile.profiler is not None:
+            try:
+                finish_profile(profile.profiler, profile.page, outcome)
+            finally:
+                _profiling.release()
+        elif busy:
+            st.caption("⏱️ Another rerun is being profiled, so this one wasn't.")
+
+
+def _package(filename):
+    # "pandas", "plotly", ... for installed code, "app" for this repo, else builtins or stdlib
+    parts = filename.replace('\\', '/').split('/')
+    if 'site-packages' in parts:
+        return parts[parts.index('site-packages') + 1].split('.')[0]
+    if filename.startswith(APP_DIR):
+        return 'app'
+    return 'builtins' if filename == '~' else 'stdlib'
+
+
+def _stats_table(stats):
+    rows = []
+    for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+        rows.append({
+            'package': _package(filename),
+            'function': function,
+            'location': f"{os.path.basename(filename)}:{line}",
+            'calls': calls,
+            'own_s': own,
+            'cumulative_s': cumulative,
+        })
+    return pd.DataFrame(rows, columns=['package', 'function', 'location', 'calls', 'own_s', 'cumulative_s'])
+
+
+def finish_profile(profiler, page, outcome=None):
+    """Stop `profiler`, save it under profiles/ labelled with `page`, and show the hot spots.
+
+    `outcome` names the exception that ended the rerun, if any.
+    """
+    profiler.disable()
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    label = re.sub(r"[^a-z0-9]+", '-', f"{page} {outcome or ''}".lower()).strip('-') or 'page'
+    # The random suffix keeps concurrent profiled sessions from overwriting each other
+    path = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{label}-{uuid.uuid4().hex[:8]}.prof")
+    stats.dump_stats(path)
+
+    ended = f" (ended by {outcome})" if outcome else ""
+    with st.expander(f"⏱️ Profile of this rerun: {stats.total_tt:.2f}s{ended}", expanded=True):
+        st.caption(f"Saved to {os.path.relpath(path, APP_DIR)}. Open it with `python -m pstats` or snakeviz.")
+        table = _stats_table(stats)
+        by_package = table.groupby('package')['own_s'].sum().sort_values(ascending=False)
+        st.write("**Time spent in each package**")
+        st.bar_chart(by_package)
+        st.write("**Hottest functions**")
+        st.dataframe(table.nlargest(TOP_FUNCTIONS, 'own_s'), use_container_width=True, hide_index=True)
@@ -0,0 +1,25 @@
+"""Start the dashboard with its caches warming in the background.
+
+Usage:
+    python serve.py [streamlit run options]   # e.g. python serve.py --server.port 8501
+
+Same as `streamlit run dashboard.py`, except the warm-up (warmup.py) begins
+as the server process starts instead of on the first visitor's rerun.
+"""
+import os
+import sys
+
+from streamlit.web import cli as stcli
+
+from data_paths import APP_DIR
+from warmup import start_warmup
+
+
+def main():
+    start_warmup()
+    sys.argv = ['streamlit', 'run', os.path.join(APP_DIR, 'dashboard.py')] + sys.argv[1:]
+    sys.exit(stcli.main())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+import csv
+import io
+import os
+import re
+import threading
+
+import numpy as np
+
+from csv_tail import read_appended
+
+# 128 MinHash permutations split into 32 LSH bands of 4 rows. Two stories
+# share a band bucket with high probability once their shingle Jaccard
+# similarity passes roughly (1/32) ** (1/4) ~ 0.42; candidates are then
+# checked against DUPLICATE_THRESHOLD on the full signature.
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+DUPLICATE_THRESHOLD = 0.7
+
+_random = np.random.RandomState(1)  # fixed, so signatures agree across processes
+_PERM_A = _random.randint(1, 1 << 63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_PERM_B = _random.randint(0, 1 << 63, size=NUM_PERM, dtype=np.uint64)
+_SHINGLE_WEIGHTS = np.uint64(256) ** np.arange(SHINGLE_SIZE - 1, -1, -1, dtype=np.uint64)
+
+
+def shingles(text):
+    """Distinct 5-byte shingles of a story as integers.
+
+    The text is lower-cased with whitespace collapsed, so re-flowed or
+    re-cased resubmissions produce the same shingles.
+    """
+    data = np.frombuffer(re.sub(r"\s+", " ", str(text).lower()).strip().encode('utf-8'), dtype=np.uint8)
+    if len(data) < SHINGLE_SIZE:
+        return np.unique(data.astype(np.uint64) @ _SHINGLE_WEIGHTS[-len(data):]) if len(data) else data.astype(np.uint64)
+    windows = np.lib.stride_tricks.sliding_window_view(data, SHINGLE_SIZE).astype(np.uint64)
+    return np.unique(windows @ _SHINGLE_WEIGHTS)
+
+
+def minhash(text):
+    """MinHash signature of a story, or None if it has no text to compare."""
+    if not isinstance(text, str):
+        return None
+    grams = shingles(text)
+    if not len(grams):
+        return None
+    # Multiply-add-shift hashing, h_i(x) = (a_i * x + b_i) >> 32 (mod 2**64), for all i at once
+    permuted = (np.multiply.outer(grams, _PERM_A) + _PERM_B) >> np.uint64(32)
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def _bands(signature):
+    return [signature[band * ROWS:(band + 1) * ROWS].tobytes() for band in range(BANDS)]
+
+
+class NearDuplicateIndex:
+    """LSH band index over MinHash signatures of the stories in `paths`.
+
+    Looking up a story hashes its signature into one bucket per band, so
+    only stories sharing a bucket are compared, independent of corpus size.
+    Stories are keyed by (file name, byte offset of their record). `sync`
+    reads each file from a byte cursor, so it costs the size of the rows
+    appended since the last call; a shrunk file or changed header rebuilds
+    the index.
+    """
+
+    def __init__(self, paths=()):
+        self.paths = list(paths)
+        self._lock = threading.Lock()
+        self._source_version = None
+        self._reset()
+
+    def _reset(self):
+        self.keys = []
+        self.signatures = []
+        self._ids = {}
+        self._buckets = [{} for _ in range(BANDS)]
+        self._files = {}  # path -> (header, cursor)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, key, signature):
+        """Index one story's signature; a key that is already indexed is ignored."""
+        with self._lock:
+            self._add(key, signature)
+
+    def _add(self, key, signature):
+        if key in self._ids:
+            return
+        doc = len(self.keys)
+        self.keys.append(key)
+        self.signatures.append(signature)
+        self._ids[key] = doc
+        if signature is not None:
+            for buckets, band in zip(self._buckets, _bands(signature)):
+                buckets.setdefault(band, []).append(doc)
+
+    def sync(self, source_version=None):
+        """Index the records appended to the files since the last call.
+
+        `source_version` is the caller's change token for the files; when it
+        matches the last call nothing is read.
+        """
+        with self._lock:
+            if source_version is not None and source_version == self._source_version:
+                return
+            if not all([self._catch_up(path) for path in self.paths]):
+                # A file was rewritten, so stories may have gone; start over
+                self._reset()
+                for path in self.paths:
+                    self._catch_up(path)
+            self._source_version = source_version
+
+    def _catch_up(self, path):
+        # Returns False if the file no longer extends what was indexed
+        header, cursor = self._files.get(path, (None, 0))
+        appended = read_appended(path, header, cursor)
+        if appended is None:
+            return header is None
+        if appended.rewritten:
+            return False
+        names = next(csv.reader([appended.header.decode('utf-8')]), [])
+        column = names.index('story') if 'story' in names else None
+        name = os.path.basename(path)
+        start = 0
+        for end in appended.ends:
+            key = (name, appended.start + start)
+            if key not in self._ids:
+                record = appended.chunk[start:end].decode('utf-8', errors='replace')
+                values = next(csv.reader(io.StringIO(record)), [])
+                text = values[column] if column is not None and column < len(values) else None
+                self._add(key, minhash(text))
+            start = int(end)
+        self._files[path] = (appended.header, appended.cursor)
+        return True
+
+    def matches(self, text, threshold=DUPLICATE_THRESHOLD):
+        """(key, estimated Jaccard similarity) of indexed stories near `text`, best first."""
+        return self.signature_matches(minhash(text), threshold)
+
+    def signature_matches(self, signature, threshold=DUPLICATE_THRESHOLD):
+        if signature is None:
+            return []
+        with self._lock:
+            candidates = set()
+            for buckets, band in zip(self._buckets, _bands(signature)):
+                candidates.update(buckets.get(band, ()))
+            found = []
+            for doc in candidates:
+                similarity = float(np.mean(self.signatures[doc] == signature))
+                if similarity >= threshold:
+                    found.append((self.keys[doc], similarity))
+        return sorted(found, key=lambda match: -match[1])
@@ -0,0 +1,170 @@
+import re
+import threading
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z']+")
+
+STOP_WORDS = frozenset("""
+a about after all also an and any are as at be been but by can could do does doing
+for from had has have having he her here him his how i if in into is it its it's just
+like many me more most my no not now of on one or other our out over really said she
+so some such than that that's the their them then there these they thing things this
+those through to too up us very was we were what when where which while who will with
+would you your i'm we're they're don't
+""".split())
+
+# Stories added since the last compaction are scored directly; past this many
+# they are folded into the term-sorted arrays
+MAX_PENDING = 256
+
+
+def tokenize(text):
+    if not isinstance(text, str):
+        return []
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+class StoryIndex:
+    """Incremental sparse TF-IDF index over story texts.
+
+    Every story is stored as (term id, log term frequency) pairs. Compacted
+    stories are kept as one set of arrays sorted by term (an inverted index),
+    so the similarity of one story to all others is a gather over its terms'
+    postings followed by a bincount, i.e. a sparse dot product. Newly added
+    stories wait in a small pending list until the next compaction.
+    Results are cached per story until the corpus changes, so callers should
+    only ask for the stories they are about to show.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.vocab = {}
+        self.doc_freq = np.zeros(0, dtype=np.int64)
+        self.doc_terms = []     # per story: term ids
+        self.doc_weights = []   # per story: 1 + log(tf)
+        self.keys = []          # caller's identifier for each story
+
+        self._post_terms = np.zeros(0, dtype=np.int64)
+        self._post_docs = np.zeros(0, dtype=np.int64)
+        self._post_weights = np.zeros(0, dtype=np.float64)
+        self._term_offsets = np.zeros(1, dtype=np.int64)
+        self._compacted = 0
+        self._norms = None
+        self._top_k = {}
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    def sync(self, keys, texts):
+        """Bring the index in line with a story list that usually only grows.
+
+        Stories past the indexed ones are added; if the already indexed
+        prefix no longer matches (the list was edited), everything is rebuilt.
+        """
+        with self._lock:
+            indexed = len(self.keys)
+            if indexed > len(keys) or self.keys != list(keys[:indexed]):
+                self._reset()
+                indexed = 0
+            if indexed < len(keys):
+                self.extend(zip(keys[indexed:], texts[indexed:]))
+
+    def add(self, key, text):
+        self.extend([(key, text)])
+
+    def extend(self, items):
+        """Add (key, text) pairs; a large batch is compacted once at the end."""
+        with self._lock:
+            added = []
+            for key, text in items:
+                ids = []
+                for token in tokenize(text):
+                    if token not in self.vocab:
+                        self.vocab[token] = len(self.vocab)
+                    ids.append(self.vocab[token])
+                terms, counts = np.unique(np.array(ids, dtype=np.int64), return_counts=True)
+                self.doc_terms.append(terms)
+                self.doc_weights.append(1.0 + np.log(counts))
+                self.keys.append(key)
+                added.append(terms)
+
+            if len(self.vocab) > len(self.doc_freq):
+                self.doc_freq = np.concatenate([self.doc_freq, np.zeros(len(self.vocab) - len(self.doc_freq), dtype=np.int64)])
+            if added:
+                self.doc_freq += np.bincount(np.concatenate(added), minlength=len(self.vocab))
+
+            # Document frequencies moved, so every norm and cached neighbour list is stale
+            self._norms = None
+            self._top_k.clear()
+            if len(self.doc_terms) - self._compacted > MAX_PENDING:
+                self._compact()
+
+    def _compact(self):
+        # Rebuild the term-sorted posting arrays from all stories
+        lengths = np.array([len(terms) for terms in self.doc_terms], dtype=np.int64)
+        terms = np.concatenate(self.doc_terms) if self.doc_terms else np.zeros(0, dtype=np.int64)
+        weights = np.concatenate(self.doc_weights) if self.doc_weights else np.zeros(0)
+        docs = np.repeat(np.arange(len(self.doc_terms)), lengths)
+        order = np.argsort(terms, kind='stable')
+        self._post_terms, self._post_docs, self._post_weights = terms[order], docs[order], weights[order]
+        self._term_offsets = np.searchsorted(self._post_terms, np.arange(len(self.vocab) + 1))
+        self._compacted = len(self.doc_terms)
+
+    def _idf(self):
+        return np.log((1 + len(self.doc_terms)) / (1 + self.doc_freq)) + 1.0
+
+    def _doc_norms(self, idf):
+        if self._norms is None:
+            lengths = np.array([len(terms) for terms in self.doc_terms], dtype=np.int64)
+            terms = np.concatenate(self.doc_terms)
+            weights = np.concatenate(self.doc_weights) * idf[terms]
+            docs = np.repeat(np.arange(len(self.doc_terms)), lengths)
+            norms = np.sqrt(np.bincount(docs, weights=weights ** 2, minlength=len(self.doc_terms)))
+            self._norms = np.where(norms > 0, norms, 1.0)
+        return self._norms
+
+    def similar(self, doc, k=3):
+        """Positions and cosine scores of the `k` stories most similar to story `doc`."""
+        with self._lock:
+            if doc in self._top_k and self._top_k[doc][2] >= k:
+                positions, scores, _ = self._top_k[doc]
+                return positions[:k], scores[:k]
+
+            idf = self._idf()
+            norms = self._doc_norms(idf)
+            terms = self.doc_terms[doc]
+            query = self.doc_weights[doc] * idf[terms] * idf[terms]
+            scores = np.zeros(len(self.doc_terms))
+
+            # Compacted stories: gather the postings of the query terms
+            compacted = terms < len(self._term_offsets) - 1
+            known = terms[compacted]
+            if len(known):
+                starts = self._term_offsets[known]
+                lengths = self._term_offsets[known + 1] - starts
+                entries = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+                query_weights = np.repeat(query[compacted], lengths)
+                scores += np.bincount(self._post_docs[entries],
+                                      weights=self._post_weights[entries] * query_weights,
+                                      minlength=len(self.doc_terms))
+
+            # Pending stories: direct sparse dot products
+            for other in range(self._compacted, len(self.doc_terms)):
+                common, query_at, other_at = np.intersect1d(terms, self.doc_terms[other], return_indices=True)
+                if len(common):
+                    scores[other] += np.dot(query[query_at], self.doc_weights[other][other_at])
+
+            scores = scores / (norms * norms[doc])
+            scores[doc] = -1.0
+            top = min(max(k, 10), len(scores) - 1)
+            if top <= 0:
+                return np.zeros(0, dtype=np.int64), np.zeros(0)
+            candidates = np.argpartition(-scores, top - 1)[:top] if top < len(scores) else np.arange(len(scores))
+            candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+            candidates = candidates[scores[candidates] > 0]
+            self._top_k[doc] = (candidates, scores[candidates], top)
+            return candidates[:k], scores[candidates][:k]
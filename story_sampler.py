@@ -0,0 +1,75 @@
+import csv
+import io
+import threading
+
+import numpy as np
+
+from csv_tail import read_appended
+
+
+class StoryOffsets:
+    """Byte offsets of the records in the stories file, for O(k) random samples.
+
+    Like SurveyState, `sync` only scans the bytes appended since `cursor`, so
+    keeping the index current costs the size of the new stories. `sample`
+    then seeks straight to k records and parses just those, however large
+    the archive grows. A shrunk file or a changed header means a rewrite,
+    and the index is rebuilt.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._source_version = None
+        self._reset()
+
+    def _reset(self):
+        self.header = None
+        self.starts = np.empty(0, dtype=np.int64)
+        self.cursor = 0
+
+    def __len__(self):
+        return len(self.starts)
+
+    def sync(self, source_version=None):
+        """Index records appended since the cursor; `source_version` skips the stat when unchanged."""
+        with self._lock:
+            if source_version is not None and source_version == self._source_version:
+                return
+            appended = read_appended(self.path, self.header, self.cursor)
+            if appended is None:
+                self._reset()
+                self._source_version = source_version
+                return
+            if self.header is None or appended.rewritten:
+                self._reset()
+                self.header = appended.header
+            ends = appended.ends
+            if len(ends):
+                starts = appended.start + np.concatenate(([0], ends[:-1]))
+                self.starts = np.concatenate((self.starts, starts))
+            self.cursor = appended.cursor
+            self._source_version = source_version
+
+    def sample(self, k, rng=None):
+        """Up to k distinct stories picked uniformly at random, as dicts keyed by the header."""
+        rng = rng or np.random.default_rng()
+        with self._lock:
+            if not len(self.starts):
+                return []
+            picks = np.sort(rng.choice(len(self.starts), size=min(k, len(self.starts)), replace=False))
+            # Each record runs to the next record's start, or to the cursor for the last one
+            spans = [(int(self.starts[i]), int(self.starts[i + 1]) if i + 1 < len(self.starts) else self.cursor)
+                     for i in picks]
+            header = self.header
+
+        names = next(csv.reader([header.decode('utf-8')]))
+        rows = []
+        with open(self.path, 'rb') as f:
+            for start, end in spans:
+                f.seek(start)
+                record = f.read(end - start).decode('utf-8', errors='replace')
+                values = next(csv.reader(io.StringIO(record)), [])
+                rows.append(dict(zip(names, values)))
+        rng.shuffle(rows)
+        return rows
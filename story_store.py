@@ -0,0 +1,88 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from admission import admitted
+from data_paths import STORY_FILE, SUBMITTED_STORY_FILE
+from data_watch import data_version, get_data_versions
+from story_dedup import NearDuplicateIndex, minhash
+from story_index import StoryIndex
+from story_sampler import StoryOffsets
+
+# --- Stories Database (CSV Storage) ---
+@st.cache_data(show_spinner=False, max_entries=2)
+def _read_stories(version):
+    # Cached per stories data version; survey changes leave this cache alone
+    try:
+        return pd.read_csv(STORY_FILE)
+    except FileNotFoundError:
+        return pd.DataFrame(columns=["timestamp", "name", "role", "story"])
+
+def load_stories():
+    return _read_stories(data_version('stories'))
+
+@st.cache_resource(show_spinner=False)
+def get_story_offsets():
+    # Record offsets into the published stories file, shared by all sessions
+    return StoryOffsets(STORY_FILE)
+
+def sample_stories(k):
+    """k random published stories, read by offset without loading the whole file."""
+    offsets = get_story_offsets()
+    offsets.sync(data_version('stories'))
+    return offsets.sample(k)
+
+def _story_keys(stories):
+    return list(zip(*(stories[column].astype(str) for column in ('timestamp', 'name', 'story'))))
+
+@st.cache_resource(show_spinner=False)
+def get_story_index():
+    # One similarity index per server process, shared by all sessions
+    return StoryIndex()
+
+def similar_story_index(stories):
+    # Stories appended since the last sync are added incrementally
+    index = get_story_index()
+    index.sync(_story_keys(stories), list(stories['story']))
+    return index
+
+@st.cache_resource(show_spinner=False)
+def get_duplicate_index():
+    # MinHash/LSH index over published and queued stories, shared by all sessions
+    return NearDuplicateIndex([STORY_FILE, SUBMITTED_STORY_FILE])
+
+def duplicate_index():
+    # Only rows appended since the last check (e.g. by other replicas) are read
+    index = get_duplicate_index()
+    index.sync(data_version('stories'))
+    return index
+
+def save_story(name, role, story):
+    """Publish a story, or queue it for moderation if it nearly duplicates a known one.
+
+    Returns the near-duplicate matches (empty when the story was published),
+    or None if the story was blank or admission control turned it away.
+    """
+    if not isinstance(story, str) or not story.strip():
+        st.warning("Please write your story before submitting.")
+        return None
+    with admitted('story') as ok:
+        if not ok:
+            return None
+        index = duplicate_index()
+        signature = minhash(story)
+        matches = index.signature_matches(signature)
+
+        new_row = pd.DataFrame([{"timestamp": datetime.now().date(), "name": name, "role": role, "story": story}])
+        target = SUBMITTED_STORY_FILE if matches else STORY_FILE
+        with open(target, 'a', newline='', encoding='utf-8') as f:
+            if f.tell() == 0:
+                f.write(new_row.iloc[:0].to_csv(index=False))
+            offset = f.tell()
+            new_row.to_csv(f, header=False, index=False)
+        # Index the new story now, under the key the next sync would give it
+        index.add((os.path.basename(target), offset), signature)
+    get_data_versions().refresh('stories')
+    return matches
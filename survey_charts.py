@@ -0,0 +1,43 @@
+import plotly.express as px
+
+from survey_schema import HR_SURVEY
+
+# Bar charts on the survey results page, keyed by the column they count, from
+# the questions' chart settings. `order` keeps the answer scale in place;
+# otherwise bars are sorted by count.
+SURVEY_CHARTS = {
+    question.column: dict(question.chart, order=list(question.options) if question.ordered else None)
+    for question in HR_SURVEY.questions if question.chart
+}
+
+# Columns of the results page: location map first on the left, then these charts
+SURVEY_CHART_LAYOUT = tuple(
+    [column for column, chart in SURVEY_CHARTS.items() if chart['panel'] == panel] for panel in (0, 1)
+)
+
+
+def chart_counts(cube, column, filters=None):
+    # Counts for one results chart, read from the survey cube
+    counts = cube.marginal(column, filters)
+    order = SURVEY_CHARTS[column].get('order')
+    if order is not None:
+        return counts.reindex(order).dropna().astype(int) if counts.sum() > 0 else counts.iloc[:0]
+    return counts[counts > 0].sort_values(ascending=False)
+
+
+def count_bar_figure(counts, column):
+    chart = SURVEY_CHARTS[column]
+    data = counts.reset_index()
+    data.columns = [chart['label'], 'Count']
+
+    fig = px.bar(data, x=chart['label'], y='Count',
+                    color=chart['label'],
+                    color_discrete_sequence=chart['colors'][:len(data)],
+                    )
+    fig.update_traces(textposition='outside')
+    fig.update_layout(
+        xaxis_title=chart['xaxis_title'],
+        yaxis_title='Frequency',
+        showlegend=False
+    )
+    return fig
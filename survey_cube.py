@@ -0,0 +1,197 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from survey_schema import HR_SURVEY
+
+
+class SurveyCube:
+    """Pre-aggregated response counts over every combination of the filter questions.
+
+    `counts` has one axis per column in `labels` (the schema's cube dimensions:
+    single-answer questions flagged as filters), so its size is the product of
+    their option counts only. Every other closed question is counted in
+    `option_counts[column]`, with the same axes plus a trailing option axis,
+    and each pair of single-answer questions off the cube is counted jointly
+    in `pair_counts[(a, b)]`, for crosstabs. Answers arrive as the schema's
+    compact codes, so building never splits strings and filtering only slices
+    these arrays. Missing answers are kept under a `None` label so totals
+    still match the row count.
+    """
+
+    def __init__(self, schema=HR_SURVEY, labels=None):
+        self.schema = schema
+        self.columns = list(schema.cube_dimensions)
+        self.labels = {column: [] for column in self.columns}
+        self._positions = {column: {} for column in self.columns}
+        self.counts = np.zeros((0,) * len(self.columns), dtype=np.int32)
+        self.option_counts = {
+            column: np.zeros((0,) * len(self.columns) + (len(schema.options(column)),), dtype=np.int32)
+            for column in schema.option_columns
+        }
+        off_cube = [column for column in schema.single_columns if column not in schema.cube_dimensions]
+        self.pair_counts = {
+            (a, b): np.zeros((0,) * len(self.columns) + (len(schema.options(a)), len(schema.options(b))), dtype=np.int32)
+            for a, b in itertools.combinations(off_cube, 2)
+        }
+
+        for column, options in schema.cube_dimensions.items():
+            # Fixed options keep their schema order, so schema codes are label positions
+            self._extend(column, options if options is not None else (labels or {}).get(column, []))
+
+    @classmethod
+    def from_frame(cls, df, schema=HR_SURVEY):
+        labels = {
+            column: sorted(df[column].dropna().unique().tolist()) if column in df.columns else []
+            for column, options in schema.cube_dimensions.items() if options is None
+        }
+        cube = cls(schema, labels)
+        cube.add_frame(df)
+        return cube
+
+    # --- Building ---
+
+    def copy(self):
+        """An independent copy, so a batch can be added without touching this cube."""
+        clone = object.__new__(type(self))
+        clone.schema = self.schema
+        clone.columns = self.columns
+        clone.labels = {column: list(labels) for column, labels in self.labels.items()}
+        clone._positions = {column: dict(positions) for column, positions in self._positions.items()}
+        clone.counts = self.counts.copy()
+        clone.option_counts = {column: array.copy() for column, array in self.option_counts.items()}
+        clone.pair_counts = {pair: array.copy() for pair, array in self.pair_counts.items()}
+        return clone
+
+    def _extend(self, column, values):
+        positions = self._positions[column]
+        new = []
+        for value in values:
+            if value not in positions:
+                positions[value] = len(self.labels[column])
+                self.labels[column].append(value)
+                new.append(value)
+        if new:
+            axis = self.columns.index(column)
+            self.counts = self._pad(self.counts, axis, len(new))
+            for tables in (self.option_counts, self.pair_counts):
+                for key, array in tables.items():
+                    tables[key] = self._pad(array, axis, len(new))
+
+    @staticmethod
+    def _pad(array, axis, extra):
+        widths = [(0, 0)] * array.ndim
+        widths[axis] = (0, extra)
+        return np.pad(array, widths)
+
+    def _codes(self, df):
+        codes = []
+        for column in self.columns:
+            if column in df.columns:
+                values = df[column].astype(object).where(df[column].notna(), None)
+            else:
+                values = pd.Series([None] * len(df), index=df.index, dtype=object)
+            if self.schema.cube_dimensions[column] is not None:
+                column_codes = self.schema.encode(column, values).astype(np.intp)
+                missing = column_codes < 0
+                if missing.any():
+                    self._extend(column, [None])
+                    column_codes[missing] = self._positions[column][None]
+            else:
+                self._extend(column, pd.unique(values))
+                column_codes = values.map(self._positions[column]).to_numpy(dtype=np.intp)
+            codes.append(column_codes)
+        return codes
+
+    @staticmethod
+    def _count(array, index):
+        flat = np.ravel_multi_index(index, array.shape)
+        array += np.bincount(flat, minlength=array.size).reshape(array.shape).astype(np.int32)
+
+    def add_frame(self, df):
+        if df.empty:
+            return
+        codes = self._codes(df)
+        self._count(self.counts, codes)
+
+        answers = {}
+        for column, array in self.option_counts.items():
+            if column not in df.columns:
+                continue
+            answer_codes = self.schema.encode(column, df[column])
+            if self.schema.by_column[column].kind == 'multi':
+                # One entry per (row, selected option) pair, read straight off the bitsets
+                rows, options = np.nonzero(self.schema.bit_matrix(column, answer_codes))
+            else:
+                answers[column] = answer_codes
+                rows = np.flatnonzero(answer_codes >= 0)
+                options = answer_codes[rows]
+            if len(rows):
+                self._count(array, [c[rows] for c in codes] + [options])
+
+        for (a, b), array in self.pair_counts.items():
+            if a in answers and b in answers:
+                rows = np.flatnonzero((answers[a] >= 0) & (answers[b] >= 0))
+                if len(rows):
+                    self._count(array, [c[rows] for c in codes] + [answers[a][rows], answers[b][rows]])
+
+    # --- Querying ---
+
+    def options(self, column):
+        # Answer labels that can be used as filter values (missing answers excluded)
+        return [label for label in self.labels[column] if label is not None]
+
+    def _selected_labels(self, column, filters):
+        if column not in self._positions:
+            # Off the cube: the schema's options, which can't be filtered on
+            return self.schema.options(column)
+        chosen = filters.get(column)
+        if not chosen:
+            return self.labels[column]
+        chosen = set(chosen)
+        return [label for label in self.labels[column] if label in chosen]
+
+    def _select(self, array, filters):
+        for axis, column in enumerate(self.columns):
+            if filters.get(column):
+                index = [self._positions[column][label] for label in self._selected_labels(column, filters)]
+                array = np.take(array, index, axis=axis)
+        return array
+
+    def total(self, filters=None):
+        return int(self._select(self.counts, filters or {}).sum())
+
+    def marginal(self, column, filters=None):
+        # Counts per answer of `column` among the responses matching `filters`
+        filters = filters or {}
+        if column in self.option_counts:
+            selected = self._select(self.option_counts[column], filters)
+            totals = selected.sum(axis=tuple(range(selected.ndim - 1)))
+            return pd.Series(totals, index=self.schema.options(column), dtype=np.int64)
+        axis = self.columns.index(column)
+        selected = self._select(self.counts, filters)
+        totals = selected.sum(axis=tuple(i for i in range(selected.ndim) if i != axis))
+        counts = pd.Series(totals, index=self._selected_labels(column, filters), dtype=np.int64)
+        return counts[[label is not None for label in counts.index]]
+
+    def crosstab(self, row, column, filters=None):
+        # Contingency table of two single-answer columns among the responses matching `filters`
+        filters = filters or {}
+        # The smallest table holding both columns: the cube, one option table or a pair table
+        if (row, column) in self.pair_counts or (column, row) in self.pair_counts:
+            pair = (row, column) if (row, column) in self.pair_counts else (column, row)
+            array, axes = self.pair_counts[pair], self.columns + list(pair)
+        elif row in self.option_counts or column in self.option_counts:
+            extra = row if row in self.option_counts else column
+            array, axes = self.option_counts[extra], self.columns + [extra]
+        else:
+            array, axes = self.counts, self.columns
+        row_axis, column_axis = axes.index(row), axes.index(column)
+        selected = self._select(array, filters)
+        table = selected.sum(axis=tuple(i for i in range(selected.ndim) if i not in (row_axis, column_axis)))
+        if row_axis > column_axis:
+            table = table.T
+        table = pd.DataFrame(table, index=self._selected_labels(row, filters),
+                             columns=self._selected_labels(column, filters), dtype=np.int64)
+        return table.loc[[label is not None for label in table.index], [label is not None for label in table.columns]]
@@ -0,0 +1,171 @@
+"""Bulk import of historical survey responses into hr_survey_data.csv.
+
+Usage:
+    python survey_import.py responses.csv [--rejects rejects.csv] [--workers 4]
+
+The input is read in chunks, each chunk is validated with vectorized checks
+derived from the survey schema (survey_schema.py), and accepted rows are appended
+to the store once per chunk. Rejected rows are written with their source row
+number and the reasons they failed.
+"""
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+from country_index import get_country_index
+from data_paths import SURVEY_FILE
+from survey_schema import HR_SURVEY
+from survey_store import prepare_store, store_lock
+
+SURVEY_COLUMNS = HR_SURVEY.columns
+
+# Bytes of input parsed per chunk (roughly 30k survey rows per 8 MB)
+CHUNK_BYTES = 32 << 20
+
+
+def _map_unique(values, func):
+    # Apply `func` once per distinct value; survey columns repeat the same few strings
+    codes, uniques = pd.factorize(values)
+    mapped = np.empty(len(uniques) + 1, dtype=object)
+    mapped[:] = [func(value) for value in uniques] + [func(None)]
+    return pd.Series(mapped[codes], index=values.index)
+
+
+def validate_chunk(chunk, first_row):
+    """Split a chunk of raw (string) rows into accepted rows and rejects.
+
+    Accepted rows come back in SURVEY_COLUMNS order with canonical country
+    names and ISO-3 codes. Rejects keep the raw values plus `row` (1-based line
+    of the data in the source file, excluding the header) and `reason`.
+    """
+    chunk = chunk.reindex(columns=SURVEY_COLUMNS)
+    checks = []
+
+    # Timestamps: fast ISO parse first, then a lenient pass for anything left over
+    timestamps = pd.to_datetime(chunk['timestamp'], errors='coerce', format='ISO8601')
+    retry = timestamps.isna() & chunk['timestamp'].notna()
+    if retry.any():
+        timestamps[retry] = pd.to_datetime(chunk.loc[retry, 'timestamp'], errors='coerce', format='mixed')
+    checks.append(("invalid timestamp", timestamps.isna()))
+
+    # Answers are checked against the schema's questions
+    checks.extend(HR_SURVEY.validate(chunk))
+    countries = _map_unique(chunk['location'], get_country_index().lookup)
+
+    failed = np.column_stack([mask.to_numpy(dtype=bool) for _, mask in checks])
+    bad = failed.any(axis=1)
+
+    accepted = chunk[~bad].copy()
+    # ISO timestamps are kept as submitted; only leniently parsed ones are rewritten
+    rewrite = retry.to_numpy() & ~bad
+    accepted.loc[rewrite[~bad], 'timestamp'] = timestamps[rewrite].astype(str).to_numpy()
+    accepted['location'] = countries[~bad].map(lambda country: country.name if country else None)
+    accepted['country_code'] = countries[~bad].map(lambda country: country.alpha_3 if country else None)
+
+    rejects = chunk[bad].copy()
+    rejects.insert(0, 'row', np.arange(first_row, first_row + len(chunk))[bad])
+    messages = np.array([message for message, _ in checks], dtype=object)
+    rejects['reason'] = ['; '.join(messages[row]) for row in failed[bad]]
+    return accepted, rejects
+
+
+def _read_chunks(source, chunk_bytes):
+    # Stream the source as DataFrames of raw strings, with blanks as missing values
+    reader = pacsv.open_csv(
+        source,
+        read_options=pacsv.ReadOptions(block_size=chunk_bytes),
+        convert_options=pacsv.ConvertOptions(
+            column_types={column: pa.string() for column in SURVEY_COLUMNS},
+            strings_can_be_null=True,
+        ),
+    )
+    for batch in reader:
+        yield batch.to_pandas()
+
+
+def _append_csv(df, path):
+    header = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, 'ab') as out:
+        pacsv.write_csv(
+            pa.Table.from_pandas(df, preserve_index=False), out,
+            write_options=pacsv.WriteOptions(include_header=header, quoting_style='needed'),
+        )
+
+
+def import_responses(source, target=SURVEY_FILE, rejects_path=None,
+                     chunk_bytes=CHUNK_BYTES, workers=None, dry_run=False):
+    """Validate `source` chunk by chunk and append accepted rows to `target`.
+
+    Chunks are validated on a process pool (at most two per worker in flight,
+    so memory stays bounded) and written in source order. Returns a summary dict.
+    """
+    workers = workers or os.cpu_count() or 1
+    if not dry_run:
+        prepare_store(target)
+    if rejects_path and os.path.exists(rejects_path):
+        os.remove(rejects_path)
+
+    summary = {'rows': 0, 'accepted': 0, 'rejected': 0}
+    started = time.perf_counter()
+
+    def write(accepted, rejects):
+        summary['rows'] += len(accepted) + len(rejects)
+        summary['accepted'] += len(accepted)
+        summary['rejected'] += len(rejects)
+        if not dry_run and not accepted.empty:
+            with store_lock(target):
+                _append_csv(accepted, target)
+        if rejects_path and not rejects.empty:
+            _append_csv(rejects, rejects_path)
+
+    chunks = _read_chunks(source, chunk_bytes)
+    first_row = 1
+    if workers == 1:
+        for chunk in chunks:
+            write(*validate_chunk(chunk, first_row))
+            first_row += len(chunk)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(validate_chunk, chunk, first_row))
+                first_row += len(chunk)
+                if len(pending) >= 2 * workers:
+                    write(*pending.popleft().result())
+            while pending:
+                write(*pending.popleft().result())
+
+    summary['seconds'] = time.perf_counter() - started
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import historical HR survey responses.")
+    parser.add_argument('source', help="CSV file with the SURVEY_COLUMNS header")
+    parser.add_argument('--target', default=SURVEY_FILE, help="survey store to append to")
+    parser.add_argument('--rejects', default=None, help="CSV file to write rejected rows to")
+    parser.add_argument('--chunk-mb', type=int, default=CHUNK_BYTES >> 20, help="input megabytes per chunk")
+    parser.add_argument('--workers', type=int, default=None, help="validation processes (default: CPU count)")
+    parser.add_argument('--dry-run', action='store_true', help="validate only, do not write to the store")
+    args = parser.parse_args()
+
+    summary = import_responses(
+        args.source, args.target, args.rejects,
+        chunk_bytes=args.chunk_mb << 20, workers=args.workers, dry_run=args.dry_run
+    )
+    rate = summary['rows'] / summary['seconds'] if summary['seconds'] else 0
+    print(f"Read {summary['rows']} rows: {summary['accepted']} accepted, {summary['rejected']} rejected "
+          f"in {summary['seconds']:.1f}s ({rate:,.0f} rows/s)")
+    if summary['rejected'] and args.rejects:
+        print(f"Rejected rows written to {args.rejects}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,266 @@
+"""Declarative definitions of the surveys.
+
+A survey is an ordered list of questions. The storage columns, the form,
+validation, the compact answer codes the aggregates are built from, and the
+results charts are all derived from it, so adding a question (or a whole
+survey) only means describing it here.
+
+Question kinds:
+    'country'  free choice among the countries of the country index; stored
+               as the canonical name plus a derived `country_code` column
+    'choice'   exactly one of `options`; encoded as a small int (-1 = missing)
+    'multi'    any subset of `options`; stored comma separated and encoded as
+               a bitset with bit i set for options[i]
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from country_index import get_country_index
+from data_paths import SURVEY_FILE
+
+Question = namedtuple('Question', [
+    'column',    # storage column
+    'prompt',    # form label
+    'kind',      # 'country', 'choice' or 'multi'
+    'options',   # answer options, in display order
+    'widget',    # Streamlit input used on the form
+    'short',     # name on filters and the trends view
+    'ordered',   # options form a scale; charts keep their order
+    'filter',    # offered as a dashboard filter (single-answer filters are the cube's axes)
+    'chart',     # results chart settings, or None
+])
+Question.__new__.__defaults__ = (None, 'selectbox', None, False, False, None)
+
+# Multi-select answers are stored as a single comma separated string
+MULTI_SEPARATOR = ", "
+
+
+def split_answers(value):
+    if pd.notna(value) and isinstance(value, str):
+        return [s.strip() for s in value.split(',') if s.strip()]
+    return []
+
+
+class SurveySchema:
+    """One survey: its questions plus everything derived from them."""
+
+    def __init__(self, name, title, file, questions):
+        self.name = name
+        self.title = title
+        self.file = file
+        self.questions = list(questions)
+        self.by_column = {question.column: question for question in self.questions}
+
+        # Storage columns, in file order
+        self.columns = ['timestamp']
+        for question in self.questions:
+            self.columns.append(question.column)
+            if question.kind == 'country':
+                self.columns.append('country_code')
+
+        # Single-answer filter questions make up the axes of the survey cube (None = labels
+        # from the data). Only these multiply its size, so other questions stay off it.
+        self.cube_dimensions = {
+            question.column: list(question.options) if question.kind == 'choice' else None
+            for question in self.questions if question.filter and question.kind in ('country', 'choice')
+        }
+        for question in self.questions:
+            if question.kind == 'country' and question.column not in self.cube_dimensions:
+                raise ValueError(f"country question {question.column!r} must be a filter")
+        # Every other closed question is counted per option against the cube's axes
+        self.option_columns = [
+            question.column for question in self.questions
+            if question.kind in ('choice', 'multi') and question.column not in self.cube_dimensions
+        ]
+        # Single-answer questions, which can be cross-tabulated against each other
+        self.single_columns = [question.column for question in self.questions if question.kind in ('country', 'choice')]
+        # Closed-choice questions tracked on the trends view
+        self.trend_columns = {
+            question.column: list(question.options)
+            for question in self.questions if question.kind in ('choice', 'multi')
+        }
+        self._codes = {
+            question.column: {option: code for code, option in enumerate(question.options)}
+            for question in self.questions if question.options
+        }
+
+    def options(self, column):
+        return list(self.by_column[column].options)
+
+    # --- Compact encoding ---
+
+    def encode(self, column, values):
+        """Codes for one column of raw answers.
+
+        'choice' columns give int8 option indexes with -1 for missing or
+        unknown answers; 'multi' columns give uint32 bitsets. Only the distinct
+        answer strings are looked at, so long columns cost one factorize.
+        """
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        mapped, _ = self._encode_unique(column, uniques)
+        return mapped[codes]
+
+    def _encode_unique(self, column, uniques):
+        # Returns the code of every distinct answer (and -1/0 for missing, at index -1)
+        # plus whether each one contains anything outside the option list
+        lookup = self._codes[column]
+        if self.by_column[column].kind == 'multi':
+            mapped = np.zeros(len(uniques) + 1, dtype=np.uint32)
+            unknown = np.zeros(len(uniques) + 1, dtype=bool)
+            for i, answer in enumerate(uniques):
+                for part in split_answers(answer):
+                    if part in lookup:
+                        mapped[i] |= np.uint32(1 << lookup[part])
+                    else:
+                        unknown[i] = True
+        else:
+            mapped = np.array([lookup.get(answer, -1) for answer in uniques] + [-1], dtype=np.int8)
+            unknown = mapped < 0
+            unknown[-1] = False
+        return mapped, unknown
+
+    def bit_matrix(self, column, bits):
+        # (rows, options) boolean matrix of a 'multi' column's bitsets
+        shifts = np.arange(len(self.by_column[column].options), dtype=np.uint32)
+        return (np.asarray(bits, dtype=np.uint32)[:, None] >> shifts) & 1 == 1
+
+    # --- Validation ---
+
+    def validate(self, frame):
+        """Vectorized checks of the answers in `frame`, as a list of (reason, failed mask).
+
+        'choice' answers are required; 'multi' answers may be empty but every
+        selected part must be a listed option; 'country' answers may be blank
+        but must resolve to a known country.
+        """
+        checks = []
+        for question in self.questions:
+            values = frame[question.column] if question.column in frame.columns else pd.Series(None, index=frame.index, dtype=object)
+            codes, uniques = pd.factorize(values)
+            if question.kind == 'country':
+                known = np.array([get_country_index().lookup(value) is not None for value in uniques] + [True])
+                failed = ~known[codes]
+                reason = f"unknown {question.column}"
+            else:
+                mapped, unknown = self._encode_unique(question.column, uniques)
+                failed = unknown[codes]
+                if question.kind == 'choice':
+                    failed = failed | (mapped[codes] < 0)
+                reason = f"invalid {question.column}"
+            checks.append((reason, pd.Series(failed, index=frame.index)))
+        return checks
+
+    # --- Storage ---
+
+    def entry(self, answers, timestamp):
+        """A storage row (dict in column order) from the answers a form returned."""
+        row = {'timestamp': timestamp}
+        for question in self.questions:
+            value = answers.get(question.column)
+            if question.kind == 'multi' and isinstance(value, (list, tuple)):
+                value = MULTI_SEPARATOR.join(value)
+            row[question.column] = value
+            if question.kind == 'country':
+                row['country_code'] = get_country_index().code_for(value)
+        return row
+
+
+HR_SURVEY = SurveySchema(
+    name='hr_survey',
+    title="HR Hiring Practices for Gig Workers: Survey",
+    file=SURVEY_FILE,
+    questions=[
+        Question(
+            'location', "Select your location/country:", 'country',
+            short="Country", filter=True,
+        ),
+        Question(
+            'department', "Select your HR department:", 'choice',
+            options=(
+                "Recruitment", "Training", "Onboarding", "Hiring",
+                "Compensation", "Employee Relations", "Talent Management",
+            ),
+            short="Department", filter=True,
+            chart=dict(
+                title="Department Distribution",
+                label='Departments',
+                xaxis_title='Participation of HR Departments in the Survey',
+                colors=["#5de0f0","#77d6f1","#90cdf2","#aac3f3","#c4b9f3","#ddb0f4","#f7a6f5"],
+                empty="No department data available",
+                panel=1,
+            ),
+        ),
+        Question(
+            'hiring_time', "1. How long does your organization typically take to hire gig workers?", 'choice',
+            options=("Less than 1 week", "1-2 weeks", "2-4 weeks", "1-2 months", "More than 2 months"),
+            widget='select_slider', short="Hiring time", ordered=True, filter=True,
+            chart=dict(
+                title="Hiring Time Analysis",
+                label='Hiring_Time',
+                xaxis_title='Global Average Hiring Time For Gig Workers',
+                colors=["#ff0f7b","#fd3e60","#fc5552","#fa6c44","#f89b29"],
+                empty="No hiring time data available",
+                panel=1,
+            ),
+        ),
+        Question(
+            'fair_strategies',
+            "2. What strategies does your organization use to make the gig-worker's hiring process fair? (Select all that apply)",
+            'multi',
+            options=(
+                "Blind resume screening",
+                "Structured interviews",
+                "Diverse hiring panels",
+                "Skills-based assessments",
+                "Standardized evaluation criteria",
+                "Bias training for interviewers",
+                "Other",
+            ),
+            widget='multiselect', short="Fair hiring strategies",
+            chart=dict(
+                title="Fair Hiring Strategies Used",
+                label='Strategy',
+                xaxis_title='Strategy',
+                colors=["#ea6016","#f3712b","#f58b51","#f0e3dd","#fc9cb5","#fa4274","#df3764"],
+                empty="No strategies data available",
+                panel=0,
+            ),
+        ),
+        Question(
+            'rehire', "3. Does your organization actively re-hire former gig workers?", 'choice',
+            options=("Yes, frequently", "Occasionally", "Rarely", "Never"),
+            widget='radio', short="Re-hiring policy", ordered=True, filter=True,
+            chart=dict(
+                title="Organizational Policies on Re-Hiring Former Gig Workers",
+                label='Rehire-Decision',
+                xaxis_title='Rehire-Decision',
+                colors=["#fff1bf","#f69ba6", "#ef6295","#ec458d"],
+                empty="No rehire data available",
+                panel=1,
+            ),
+        ),
+        Question(
+            'payment_negotiation',
+            "4. How does your organization typically negotiate with gig workers and decide on their payment?",
+            'choice',
+            options=(
+                "Fixed salary bands with no negotiation",
+                "Negotiation based on candidate's current salary",
+                "Negotiation based on market rates",
+                "Negotiation based on skills assessment",
+                "Other approach",
+            ),
+            short="Payment negotiation",
+            chart=dict(
+                title="Approaches for Payment Negotiation with Gig Workers",
+                label='Payment-Negotiation',
+                xaxis_title='Payment-Negotiation',
+                colors=["#ff1b6b","#e03884","#c1559c","#a273b5","#8390ce","#64ade6","#45caff"],
+                empty="No payment negotiation data available",
+                panel=0,
+            ),
+        ),
+    ],
+)
@@ -0,0 +1,78 @@
+import collections
+import io
+import threading
+
+import pandas as pd
+
+from csv_tail import read_appended
+from survey_cube import SurveyCube
+from survey_schema import HR_SURVEY
+from survey_trends import SurveyTrends
+
+# One consistent view of the aggregates; a published snapshot is never modified
+SurveySnapshot = collections.namedtuple('SurveySnapshot', 'cube trends rows version')
+
+
+class SurveyState:
+    """Survey aggregates kept current by reading only the rows appended to the file.
+
+    `cursor` is the byte offset just past the last complete row folded into
+    `snapshot`, whose `version` counts the batches applied. Catching up
+    reads the file from the cursor, so an append costs the size of the new
+    rows rather than a reload. If the file shrank or its header changed (a
+    rewrite or a column migration), everything is rebuilt from scratch.
+
+    Each batch is added to copies of the cube and trends, and the result is
+    published as a new snapshot in one assignment, so readers never see a
+    half-applied batch and need no lock.
+    """
+
+    def __init__(self, path, schema=HR_SURVEY):
+        self.path = path
+        self.schema = schema
+        self._lock = threading.Lock()
+        self._source_version = None
+        self._reset()
+
+    def _reset(self):
+        version = self.snapshot.version + 1 if hasattr(self, 'snapshot') else 1
+        self.snapshot = SurveySnapshot(SurveyCube(self.schema), SurveyTrends(self.schema), 0, version)
+        self.cursor = 0
+        self.header = None
+
+    def catch_up(self, source_version=None):
+        """Fold rows appended since the cursor into the aggregates; returns the snapshot.
+
+        `source_version` is the caller's cheap change token for the file (the
+        watcher's data version); when it matches the last call the file isn't
+        even stat'ed.
+        """
+        with self._lock:
+            if source_version is not None and source_version == self._source_version:
+                return self.snapshot
+            appended = read_appended(self.path, self.header, self.cursor)
+            if appended is None:
+                if self.snapshot.rows or self.header is not None:
+                    self._reset()
+                self._source_version = source_version
+                return self.snapshot
+            if appended.rewritten:
+                self._reset()
+            self.header = appended.header
+            # A writer may be mid-row; a partial last record waits for next time
+            if len(appended.ends):
+                self._apply(appended.chunk[:appended.ends[-1]])
+            self.cursor = appended.cursor
+            self._source_version = source_version
+            return self.snapshot
+
+    def _apply(self, chunk):
+        names = pd.read_csv(io.BytesIO(self.header), nrows=0).columns
+        delta = pd.read_csv(io.BytesIO(chunk), header=None, names=names)
+        if delta.empty:
+            return
+        current = self.snapshot
+        cube, trends = current.cube.copy(), current.trends.copy()
+        cube.add_frame(delta)
+        trends.add_frame(delta)
+        self.snapshot = SurveySnapshot(cube, trends, current.rows + len(delta), current.version + 1)
@@ -0,0 +1,68 @@
+import math
+from collections import namedtuple
+
+import numpy as np
+
+ChiSquare = namedtuple('ChiSquare', ['statistic', 'dof', 'p_value', 'cramers_v', 'responses', 'sparse_share'])
+
+
+def _gamma_q(a, x, tolerance=1e-12, max_iterations=500):
+    """Regularized upper incomplete gamma function Q(a, x).
+
+    Series expansion below x < a + 1, continued fraction above (the usual
+    split, as in Numerical Recipes), so the chi-square tail needs no SciPy.
+    """
+    if x <= 0:
+        return 1.0
+    log_prefix = a * math.log(x) - x - math.lgamma(a)
+    if x < a + 1:
+        term = total = 1.0 / a
+        n = a
+        for _ in range(max_iterations):
+            n += 1
+            term *= x / n
+            total += term
+            if abs(term) < abs(total) * tolerance:
+                break
+        return max(0.0, 1.0 - total * math.exp(log_prefix))
+    # Modified Lentz evaluation of the continued fraction
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, max_iterations):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < tolerance:
+            break
+    return min(1.0, math.exp(log_prefix) * h)
+
+
+def chi_square(table):
+    """Pearson chi-square test of independence and Cramér's V for a contingency table.
+
+    Rows and columns without any responses are dropped first. `sparse_share`
+    is the share of cells with an expected count below 5, where the
+    chi-square approximation gets unreliable.
+    """
+    observed = np.asarray(table, dtype=np.float64)
+    observed = observed[observed.sum(axis=1) > 0][:, observed.sum(axis=0) > 0]
+    n = observed.sum()
+    rows, columns = observed.shape if observed.ndim == 2 else (0, 0)
+    if n == 0 or rows < 2 or columns < 2:
+        return ChiSquare(float('nan'), 0, float('nan'), float('nan'), int(n), float('nan'))
+
+    expected = np.outer(observed.sum(axis=1), observed.sum(axis=0)) / n
+    statistic = float(((observed - expected) ** 2 / expected).sum())
+    dof = (rows - 1) * (columns - 1)
+    p_value = _gamma_q(dof / 2, statistic / 2)
+    cramers_v = math.sqrt(statistic / (n * (min(rows, columns) - 1)))
+    return ChiSquare(statistic, dof, p_value, cramers_v, int(n), float((expected < 5).mean()))
@@ -0,0 +1,71 @@
+"""The survey response store (hr_survey_data.csv) shared by every replica.
+
+Rows are only ever appended, by the survey form and by the bulk importer.
+The one rewrite, migrating a file written with an older header to
+SURVEY_COLUMNS, runs once per process at startup. Every write holds
+`<store>.lock`, so no replica's append can land between the migration's
+read and its rewrite and be lost, and a bulk import's chunks never
+interleave with a form submission.
+"""
+import contextlib
+import os
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are not serialized across processes
+    fcntl = None
+
+from country_index import get_country_index
+from survey_schema import HR_SURVEY
+
+SURVEY_COLUMNS = HR_SURVEY.columns
+
+
+@contextlib.contextmanager
+def store_lock(target):
+    """Hold the store's lock file for the duration of a write."""
+    if fcntl is None:
+        yield
+        return
+    with open(f"{target}.lock", 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _current_header(target):
+    try:
+        return list(pd.read_csv(target, nrows=0).columns)
+    except (FileNotFoundError, pd.errors.EmptyDataError):
+        return None
+
+
+def prepare_store(target):
+    """Create the store, or migrate an older header to SURVEY_COLUMNS; a no-op once current."""
+    if _current_header(target) == SURVEY_COLUMNS:
+        return
+    with store_lock(target):
+        # Another replica may have migrated it while we waited for the lock
+        header = _current_header(target)
+        if header == SURVEY_COLUMNS:
+            return
+        if header is None:
+            data = pd.DataFrame(columns=SURVEY_COLUMNS)
+        else:
+            data = pd.read_csv(target)
+            if 'country_code' not in data.columns:
+                data['country_code'] = data['location'].map(get_country_index().code_for)
+        partial = f"{target}.{os.getpid()}.part"
+        data.reindex(columns=SURVEY_COLUMNS).to_csv(partial, index=False)
+        os.replace(partial, target)
+
+
+def append_responses(df, target=HR_SURVEY.file):
+    """Append rows in SURVEY_COLUMNS order, writing the header if the store is new."""
+    with store_lock(target):
+        with open(target, 'a', newline='', encoding='utf-8') as out:
+            df.reindex(columns=SURVEY_COLUMNS).to_csv(out, header=out.tell() == 0, index=False)
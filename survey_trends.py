@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+
+from survey_schema import HR_SURVEY
+
+# Bucket sizes offered on the trends view, mapped to pandas period codes
+TREND_FREQUENCIES = {'Day': 'D', 'Week': 'W', 'Month': 'M'}
+
+
+def _bucket_starts(timestamps, freq):
+    return timestamps.dt.to_period(freq).dt.start_time
+
+
+class SurveyTrends:
+    """Timestamp-sorted response index with per-bucket answer counters.
+
+    `timestamps` stays sorted so date ranges are two binary searches. For every
+    frequency in TREND_FREQUENCIES, `responses[freq]` maps a bucket start to the
+    number of responses in it and `answers[freq][column]` maps it to an array of
+    counts aligned with the options of the schema's trend column. Answers are
+    counted from their compact codes, and new responses only touch their own
+    buckets, so charts never resample the raw rows.
+    """
+
+    def __init__(self, schema=HR_SURVEY):
+        self.schema = schema
+        self.timestamps = np.array([], dtype='datetime64[ns]')
+        self.responses = {freq: {} for freq in TREND_FREQUENCIES.values()}
+        self.answers = {
+            freq: {column: {} for column in schema.trend_columns}
+            for freq in TREND_FREQUENCIES.values()
+        }
+
+    @classmethod
+    def from_frame(cls, df, schema=HR_SURVEY):
+        trends = cls(schema)
+        trends.add_frame(df)
+        return trends
+
+    def copy(self):
+        """An independent copy, so a batch can be added without touching these counters."""
+        clone = type(self)(self.schema)
+        clone.timestamps = self.timestamps
+        clone.responses = {freq: dict(buckets) for freq, buckets in self.responses.items()}
+        clone.answers = {
+            freq: {column: dict(counters) for column, counters in columns.items()}
+            for freq, columns in self.answers.items()
+        }
+        return clone
+
+    def add_frame(self, df):
+        if df.empty or 'timestamp' not in df.columns:
+            return
+        timestamps = pd.to_datetime(df['timestamp'], errors='coerce', format='mixed')
+        valid = timestamps.notna()
+        df, timestamps = df[valid], timestamps[valid]
+        if df.empty:
+            return
+
+        new = np.sort(timestamps.to_numpy(dtype='datetime64[ns]'))
+        if len(self.timestamps) and new[0] < self.timestamps[-1]:
+            self.timestamps = np.sort(np.concatenate([self.timestamps, new]))
+        else:
+            self.timestamps = np.concatenate([self.timestamps, new])
+
+        # Encode every tracked column once; each frequency only re-buckets the rows
+        codes = {}
+        for column in self.schema.trend_columns:
+            if column in df.columns:
+                codes[column] = self.schema.encode(column, df[column])
+
+        for freq in TREND_FREQUENCIES.values():
+            bucket_codes, buckets = pd.factorize(_bucket_starts(timestamps, freq))
+            for bucket, count in zip(buckets, np.bincount(bucket_codes)):
+                self.responses[freq][bucket] = self.responses[freq].get(bucket, 0) + int(count)
+
+            for column, column_codes in codes.items():
+                width = len(self.schema.trend_columns[column])
+                if self.schema.by_column[column].kind == 'multi':
+                    rows, options = np.nonzero(self.schema.bit_matrix(column, column_codes))
+                    cells = bucket_codes[rows] * width + options
+                else:
+                    answered = column_codes >= 0
+                    cells = bucket_codes[answered] * width + column_codes[answered]
+                table = np.bincount(cells, minlength=len(buckets) * width).reshape(len(buckets), width)
+                counters = self.answers[freq][column]
+                for bucket, row in zip(buckets, table):
+                    # A new array rather than +=, since copies share the counters they started with
+                    counters[bucket] = counters[bucket] + row if bucket in counters else row.astype(np.int64)
+
+    # --- Querying ---
+
+    def date_range(self):
+        if not len(self.timestamps):
+            return None
+        return pd.Timestamp(self.timestamps[0]), pd.Timestamp(self.timestamps[-1])
+
+    def count_between(self, start, end):
+        # Responses with start <= timestamp < end, via binary search on the sorted index
+        lo, hi = np.searchsorted(self.timestamps, [np.datetime64(start, 'ns'), np.datetime64(end, 'ns')])
+        return int(hi - lo)
+
+    def response_series(self, frequency, start=None, end=None):
+        freq = TREND_FREQUENCIES[frequency]
+        series = pd.Series(self.responses[freq], dtype=np.int64).sort_index()
+        return self._clip(series, freq, start, end)
+
+    def answer_frame(self, frequency, column, start=None, end=None):
+        freq = TREND_FREQUENCIES[frequency]
+        counters = self.answers[freq][column]
+        buckets = sorted(counters)
+        frame = pd.DataFrame(
+            [counters[bucket] for bucket in buckets],
+            index=pd.DatetimeIndex(buckets), columns=self.schema.trend_columns[column]
+        )
+        return self._clip(frame, freq, start, end)
+
+    @staticmethod
+    def _clip(data, freq, start, end):
+        # Keep every bucket overlapping [start, end), including ones that begin before start
+        if start is not None:
+            bucket_ends = pd.DatetimeIndex(data.index).to_period(freq).end_time
+            data = data[bucket_ends >= pd.Timestamp(start)]
+        if end is not None:
+            data = data[data.index < pd.Timestamp(end)]
+        return data
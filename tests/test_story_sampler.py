@@ -0,0 +1,53 @@
+import numpy as np
+
+from csv_tail import record_ends
+from story_sampler import StoryOffsets
+
+HEADER = b'timestamp,name,role,story\n'
+PLAIN = b'2025-07-17,Ana,HR Lead,Short story\n'
+MULTILINE = b'2025-07-18,Ben,Recruiter,"First line\nsecond line, with a comma"\n'
+ESCAPED = b'2025-07-19,Cy,Manager,"She said ""no\n"" twice"\n'
+
+
+def test_newlines_inside_quotes_do_not_end_a_record():
+    chunk = PLAIN + MULTILINE
+    assert list(record_ends(chunk)) == [len(PLAIN), len(chunk)]
+
+
+def test_escaped_quotes_keep_the_field_open():
+    chunk = ESCAPED + PLAIN
+    assert list(record_ends(chunk)) == [len(ESCAPED), len(chunk)]
+
+
+def test_trailing_partial_record_is_left_out():
+    chunk = PLAIN + b'2025-07-20,Di,HR,"still being\nwritten'
+    assert list(record_ends(chunk)) == [len(PLAIN)]
+    assert len(record_ends(b'')) == 0
+
+
+def test_offsets_index_complete_records_and_resume_after_a_partial_one(tmp_path):
+    path = tmp_path / 'stories.csv'
+    partial = b'2025-07-20,Di,HR,"still being\n'
+    path.write_bytes(HEADER + MULTILINE + ESCAPED + partial)
+    offsets = StoryOffsets(str(path))
+    offsets.sync()
+    assert len(offsets) == 2
+    assert offsets.cursor == len(HEADER + MULTILINE + ESCAPED)
+
+    with open(path, 'ab') as f:
+        f.write(b'written"\n')
+    offsets.sync()
+    assert len(offsets) == 3
+    stories = sorted(row['story'] for row in offsets.sample(5, np.random.default_rng(0)))
+    assert stories == ['First line\nsecond line, with a comma', 'She said "no\n" twice', 'still being\nwritten']
+
+
+def test_a_rewritten_file_is_reindexed(tmp_path):
+    path = tmp_path / 'stories.csv'
+    path.write_bytes(HEADER + MULTILINE + ESCAPED)
+    offsets = StoryOffsets(str(path))
+    offsets.sync()
+    path.write_bytes(HEADER + PLAIN)
+    offsets.sync()
+    assert len(offsets) == 1
+    assert offsets.sample(1)[0]['name'] == 'Ana'
@@ -0,0 +1,48 @@
+import pandas as pd
+
+from survey_cube import SurveyCube
+from survey_schema import HR_SURVEY, SurveySchema
+
+ROWS = pd.DataFrame({
+    'timestamp': ['2025-07-17'] * 5,
+    'location': ['Germany', 'Germany', 'France', 'France', None],
+    'department': ['Recruitment', 'Training', 'Training', 'Recruitment', 'Training'],
+    'hiring_time': ['1-2 weeks', 'Less than 1 week', '1-2 weeks', None, '1-2 weeks'],
+    'fair_strategies': ['Blind resume screening', '', 'Other', None, 'Other'],
+    'rehire': ['Rarely', 'Never', 'Rarely', 'Rarely', 'Never'],
+    'payment_negotiation': ['Other approach'] * 3 + ["Negotiation based on market rates"] * 2,
+})
+
+
+def labels(schema, column):
+    if schema.by_column[column].kind == 'country':
+        return sorted(ROWS[column].dropna().unique())
+    return schema.options(column)
+
+
+def expected_crosstab(row, column, schema):
+    table = pd.crosstab(ROWS[row], ROWS[column])
+    return table.reindex(index=labels(schema, row), columns=labels(schema, column), fill_value=0)
+
+
+def test_only_filter_questions_are_cube_axes():
+    cube = SurveyCube.from_frame(ROWS)
+    assert cube.columns == ['location', 'department', 'hiring_time', 'rehire']
+    assert set(cube.option_counts) == {'fair_strategies', 'payment_negotiation'}
+    assert cube.total() == 5
+    assert cube.marginal('payment_negotiation')['Other approach'] == 3
+
+
+def test_crosstabs_match_pandas_on_and_off_the_cube():
+    # With two fewer filters, department and hiring_time move off the cube into pair tables
+    schema = SurveySchema('test', 'Test', None, [
+        question._replace(filter=False) if question.column in ('department', 'hiring_time') else question
+        for question in HR_SURVEY.questions
+    ])
+    cube = SurveyCube.from_frame(ROWS, schema)
+    assert cube.columns == ['location', 'rehire']
+    for row, column in [('department', 'hiring_time'), ('hiring_time', 'payment_negotiation'),
+                        ('rehire', 'department'), ('location', 'rehire')]:
+        table = cube.crosstab(row, column)
+        pd.testing.assert_frame_equal(table, expected_crosstab(row, column, schema),
+                                      check_names=False, check_dtype=False)
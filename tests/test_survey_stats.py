@@ -0,0 +1,43 @@
+import math
+
+import numpy as np
+import pytest
+
+from survey_stats import _gamma_q, chi_square
+
+
+@pytest.mark.parametrize('x', [0.01, 0.5, 1.0, 1.9, 2.5, 10.0, 40.0])
+def test_gamma_q_matches_closed_forms(x):
+    # Both sides of the series / continued fraction split at x = a + 1
+    assert _gamma_q(1, x) == pytest.approx(math.exp(-x), rel=1e-10)
+    assert _gamma_q(0.5, x) == pytest.approx(math.erfc(math.sqrt(x)), rel=1e-10)
+
+
+def test_gamma_q_is_one_at_zero():
+    assert _gamma_q(2.5, 0) == 1.0
+
+
+def test_chi_square_of_a_known_table():
+    # Expected counts 12, 18 / 28, 42
+    test = chi_square([[10, 20], [30, 40]])
+    assert test.statistic == pytest.approx(4 / 12 + 4 / 18 + 4 / 28 + 4 / 42)
+    assert test.dof == 1
+    # With one degree of freedom the tail is erfc(sqrt(statistic / 2))
+    assert test.p_value == pytest.approx(math.erfc(math.sqrt(test.statistic / 2)))
+    assert test.p_value == pytest.approx(0.3730, abs=1e-4)
+    assert test.cramers_v == pytest.approx(math.sqrt(test.statistic / 100))
+    assert test.responses == 100
+    assert test.sparse_share == 0
+
+
+def test_empty_rows_and_columns_are_dropped():
+    table = [[10, 0, 20], [0, 0, 0], [30, 0, 40]]
+    assert chi_square(table) == chi_square([[10, 20], [30, 40]])
+
+
+def test_dof_zero_when_fewer_than_two_answers_remain():
+    for table in ([[5, 7]], [[5], [7]], [[0, 0], [0, 0]], [[3, 0], [0, 0]]):
+        test = chi_square(table)
+        assert test.dof == 0
+        assert math.isnan(test.statistic) and math.isnan(test.p_value)
+        assert test.responses == int(np.sum(table))
@@ -0,0 +1,32 @@
+import pandas as pd
+
+from survey_trends import SurveyTrends
+
+
+def make_trends(timestamps):
+    return SurveyTrends.from_frame(pd.DataFrame({
+        'timestamp': timestamps,
+        'rehire': ['Rarely'] * len(timestamps),
+    }))
+
+
+def test_range_starting_mid_bucket_keeps_the_overlapping_bucket():
+    trends = make_trends(['2025-07-17 12:30', '2025-07-18 09:00', '2025-08-02 10:00'])
+    start, end = pd.Timestamp('2025-07-17'), pd.Timestamp('2025-07-19')
+
+    months = trends.response_series('Month', start, end)
+    assert list(months.index) == [pd.Timestamp('2025-07-01')]
+    assert list(months) == [2]
+
+    weeks = trends.answer_frame('Week', 'rehire', start, end)
+    assert list(weeks.index) == [pd.Timestamp('2025-07-14')]
+    assert weeks.loc[pd.Timestamp('2025-07-14'), 'Rarely'] == 2
+
+
+def test_buckets_outside_the_range_are_dropped():
+    trends = make_trends(['2025-06-30 12:00', '2025-07-17 12:30', '2025-08-02 10:00'])
+
+    days = trends.response_series('Day', pd.Timestamp('2025-07-01'), pd.Timestamp('2025-08-01'))
+    assert list(days.index) == [pd.Timestamp('2025-07-17')]
+    months = trends.response_series('Month', pd.Timestamp('2025-07-17'), pd.Timestamp('2025-07-18'))
+    assert list(months.index) == [pd.Timestamp('2025-07-01')]
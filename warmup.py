@@ -0,0 +1,123 @@
+"""Background warm-up of the process-wide caches.
+
+`start_warmup()` fills the caches every page depends on (country index,
+survey aggregates, map geometry, story indexes, page snapshots) on a small
+thread pool, so the first visitor after a deploy doesn't pay for the cold
+loads. It is idempotent: serve.py calls it before the server starts
+accepting sessions, and dashboard.py calls it on every rerun in case the
+app was started with plain `streamlit run`.
+"""
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from streamlit.runtime import Runtime
+
+from data_paths import APP_DIR
+
+WARMUP_WORKERS = 4
+# cache_data lives in the runtime's storage, so wait for the runtime before loading
+RUNTIME_WAIT_SECONDS = 60
+
+
+def _warm_country_index():
+    from country_index import get_country_index
+    get_country_index()
+
+
+def _warm_survey():
+    from hr_survey import get_survey_state
+    get_survey_state()
+
+
+def _warm_map():
+    from hr_survey import load_world
+    load_world()
+
+
+def _warm_stories():
+    from story_store import duplicate_index, load_stories, sample_stories, similar_story_index
+    similar_story_index(load_stories())
+    duplicate_index()
+    sample_stories(0)
+
+
+def _warm_snapshots():
+    # Rendered in a child process, like the on-demand re-renders
+    subprocess.run([sys.executable, os.path.join(APP_DIR, 'report_snapshots.py')], cwd=APP_DIR, check=True)
+
+
+WARMUP_TASKS = {
+    "Country list": _warm_country_index,
+    "Survey data": _warm_survey,
+    "Map geometry": _warm_map,
+    "Stories": _warm_stories,
+    "Page snapshots": _warm_snapshots,
+}
+
+
+class Warmup:
+    """Status of the warm-up tasks: 'pending', 'running', 'ready' or 'failed'."""
+
+    def __init__(self, tasks=WARMUP_TASKS):
+        self.tasks = dict(tasks)
+        self.status = {name: 'pending' for name in self.tasks}
+        self.seconds = {}
+        self.errors = {}
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+        self._remaining = len(self.tasks)
+
+    def start(self):
+        threading.Thread(target=self._run, name='cache-warmup', daemon=True).start()
+        return self
+
+    def _run(self):
+        deadline = time.monotonic() + RUNTIME_WAIT_SECONDS
+        while not Runtime.exists() and time.monotonic() < deadline:
+            time.sleep(0.1)
+        pool = ThreadPoolExecutor(max_workers=WARMUP_WORKERS, thread_name_prefix='cache-warmup')
+        for name in self.tasks:
+            pool.submit(self._task, name)
+        pool.shutdown(wait=False)
+
+    def _task(self, name):
+        self.status[name] = 'running'
+        started = time.perf_counter()
+        try:
+            self.tasks[name]()
+            self.status[name] = 'ready'
+        except Exception as e:
+            # A failed warm-up only means the first page that needs it loads it itself
+            self.status[name] = 'failed'
+            self.errors[name] = repr(e)
+        self.seconds[name] = time.perf_counter() - started
+        with self._lock:
+            self._remaining -= 1
+            if not self._remaining:
+                self.done.set()
+                print("Cache warm-up finished: " + ", ".join(
+                    f"{name} {self.status[name]} ({self.seconds[name]:.1f}s)" for name in self.tasks))
+
+    @property
+    def ready(self):
+        return self.done.is_set()
+
+    def progress(self):
+        return sum(status in ('ready', 'failed') for status in self.status.values()), len(self.tasks)
+
+
+_warmup = None
+_warmup_lock = threading.Lock()
+
+
+def start_warmup():
+    """Start the warm-up once per process and return its Warmup."""
+    global _warmup
+    with _warmup_lock:
+        if _warmup is None:
+            _warmup = Warmup().start()
+        return _warmup